@@ -0,0 +1,54 @@
+import numpy as np
+
+from interval_module import IntervalArray
+
+
+# Параметризация по умолчанию: все элементы базовых матриц расширяются на eps,
+# как в get_interval_matrix
+def radius_matrices(bases, eps):
+    return IntervalArray.from_mid_rad(bases, eps[:, np.newaxis, np.newaxis])
+
+
+# Определители пачки интервальных матриц 2x2
+def determ_2x2(matrices):
+    return matrices[:, 0, 0] * matrices[:, 1, 1] - matrices[:, 0, 1] * matrices[:, 1, 0]
+
+
+def optimize_batch(bases, left, right, delta, get_matrices=radius_matrices, determ=determ_2x2):
+    """Бисекция по eps сразу для пачки базовых матриц.
+
+    Границы left/right хранятся массивами по одной паре на матрицу, на каждой
+    итерации все ещё не сошедшиеся матрицы обрабатываются одним векторным шагом.
+    Возвращает (right, left, counter) - массивы той же длины, что и bases.
+    """
+    left = np.array(left, dtype=np.float64)
+    right = np.array(right, dtype=np.float64)
+    counter = np.zeros(len(bases), dtype=int)
+
+    active = np.flatnonzero(right - left > delta)
+    while active.size:
+        c = (left[active] + right[active]) / 2
+        interval = determ(get_matrices(bases[active], c))
+        singular = interval.contains(0.0)
+
+        right[active] = np.where(singular, c, right[active])
+        left[active] = np.where(singular, left[active], c)
+        counter[active] += 1
+
+        # Сошедшиеся матрицы исключаются из дальнейших шагов
+        active = active[right[active] - left[active] > delta]
+
+    return right, left, counter
+
+
+def determinant_optimization_batch(bases, delta=1e-5, get_matrices=radius_matrices, determ=determ_2x2):
+    """Пакетный аналог determinant_optimization_new для стека матриц формы (B, n, n)."""
+    bases = np.asarray(bases, dtype=np.float64)
+    # Как и в determinant_optimization_new, правая граница - максимальная середина
+    eps_right = bases.reshape(len(bases), -1).max(axis=1)
+    eps_left = np.zeros(len(bases))
+
+    eps_curr, _, amount = optimize_batch(bases, eps_left, eps_right, delta,
+                                         get_matrices=get_matrices, determ=determ)
+    print(f"Кол-во векторных шагов: {amount.max(initial=0)}, матриц: {len(bases)}")
+    return eps_curr
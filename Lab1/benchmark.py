@@ -0,0 +1,97 @@
+import timeit
+
+import numpy as np
+
+from interval_module import Interval, IntervalArray, verified_arithmetic
+
+
+# Прежняя реализация интервала (до перехода на __slots__) - эталон для сравнения
+class LegacyInterval:
+    def __init__(self, lower, upper):
+        if lower > upper:
+            raise ValueError("Lower bound cannot be greater than upper bound.")
+        self.lower = lower
+        self.upper = upper
+
+    def __mul__(self, other):
+        products = np.array([
+            self.lower * other.lower,
+            self.lower * other.upper,
+            self.upper * other.lower,
+            self.upper * other.upper
+        ])
+        return LegacyInterval(np.min(products), np.max(products))
+
+    def __truediv__(self, other):
+        divisions = np.array([
+            self.lower / other.lower,
+            self.lower / other.upper,
+            self.upper / other.lower,
+            self.upper / other.upper
+        ])
+        return LegacyInterval(np.min(divisions), np.max(divisions))
+
+    def __and__(self, other):
+        new_lower = max(self.lower, other.lower)
+        new_upper = min(self.upper, other.upper)
+        if new_lower > new_upper:
+            return LegacyInterval(0, 0)
+        return LegacyInterval(new_lower, new_upper)
+
+
+def make_rows(cls, n, eps=0.1, seed=0):
+    rng = np.random.default_rng(seed)
+    mids = rng.uniform(0.5, 1.5, size=(2, n))
+    return [[cls(float(m - eps), float(m + eps)) for m in row] for row in mids]
+
+
+# Нагрузка как в is_scalar: деление строк поэлементно и пересечение отношений
+def scalar_workload(v1, v2):
+    item = v1[0] / v2[0]
+    for i in range(1, len(v1)):
+        item = item & (v1[i] / v2[i])
+    return item
+
+
+def mul_workload(v1, v2):
+    for a, b in zip(v1, v2):
+        a * b
+
+
+def div_workload(v1, v2):
+    for a, b in zip(v1, v2):
+        a / b
+
+
+def run(n=1000, repeat=5, number=20):
+    workloads = {"mul": mul_workload, "div": div_workload, "is_scalar": scalar_workload}
+    print(f"{'workload':<12}{'legacy, ms':>14}{'slots, ms':>14}{'speedup':>10}")
+    for name, workload in workloads.items():
+        timings = []
+        for cls in (LegacyInterval, Interval):
+            v1, v2 = make_rows(cls, n)
+            best = min(timeit.repeat(lambda: workload(v1, v2), repeat=repeat, number=number))
+            timings.append(best / number * 1e3)
+        print(f"{name:<12}{timings[0]:>14.3f}{timings[1]:>14.3f}{timings[0] / timings[1]:>9.1f}x")
+
+
+# Цена проверенного режима (округление наружу) относительно обычной арифметики
+def run_verified(sizes=(1000, 100_000, 1_000_000), repeat=5, number=10):
+    ops = {"add": lambda a, b: a + b, "mul": lambda a, b: a * b, "div": lambda a, b: a / b}
+    print(f"{'op':<6}{'size':>10}{'float, ms':>12}{'verified, ms':>14}{'ratio':>8}")
+    rng = np.random.default_rng(0)
+    for n in sizes:
+        mid = rng.uniform(0.5, 1.5, size=(2, n))
+        a, b = IntervalArray.from_mid_rad(mid[0], 0.1), IntervalArray.from_mid_rad(mid[1], 0.1)
+        for name, op in ops.items():
+            timings = []
+            for verified in (False, True):
+                with verified_arithmetic(verified):
+                    best = min(timeit.repeat(lambda: op(a, b), repeat=repeat, number=number))
+                timings.append(best / number * 1e3)
+            print(f"{name:<6}{n:>10}{timings[0]:>12.3f}{timings[1]:>14.3f}{timings[1] / timings[0]:>7.2f}x")
+
+
+if __name__ == "__main__":
+    run()
+    run_verified()
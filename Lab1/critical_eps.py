@@ -0,0 +1,114 @@
+import numpy as np
+
+from interval_module import IntervalArray
+
+
+# Приведение матрицы из Interval-объектов к IntervalArray
+def as_interval_array(matrix):
+    if isinstance(matrix, IntervalArray):
+        return matrix
+    return IntervalArray.from_intervals(matrix)
+
+
+def affine_family(get_matrix, probe=1.0, rtol=1e-9, m0=None):
+    """Представляет семейство get_matrix(eps) в виде концов, линейных по eps.
+
+    Возвращает массивы коэффициентов (lower0, lower1, upper0, upper1), для которых
+    концы элементов равны lower0 + lower1 * eps и upper0 + upper1 * eps,
+    либо None, если семейство не является аффинным по eps.
+    """
+    if m0 is None:
+        m0 = as_interval_array(get_matrix(0.0))
+    m1 = as_interval_array(get_matrix(probe))
+    m2 = as_interval_array(get_matrix(2.5 * probe))
+
+    lower1 = (m1.lower - m0.lower) / probe
+    upper1 = (m1.upper - m0.upper) / probe
+    # Проверка линейности по третьей точке
+    scale = 1 + np.abs(m2.lower).max() + np.abs(m2.upper).max()
+    if not (np.allclose(m0.lower + 2.5 * probe * lower1, m2.lower, rtol=rtol, atol=rtol * scale) and
+            np.allclose(m0.upper + 2.5 * probe * upper1, m2.upper, rtol=rtol, atol=rtol * scale)):
+        return None
+    return m0.lower, lower1, m0.upper, upper1
+
+
+# Квадратичные многочлены для четырёх произведений концов двух элементов
+def _endpoint_products(x0, x1, y0, y1):
+    xs = [(x0[0], x1[0]), (x0[1], x1[1])]
+    ys = [(y0[0], y1[0]), (y0[1], y1[1])]
+    return np.array([[x[0] * y[0], x[0] * y[1] + x[1] * y[0], x[1] * y[1]] for x in xs for y in ys])
+
+
+# Вещественные корни c0 + c1 * eps + c2 * eps^2 внутри (left, right)
+def _real_roots(coeffs, left, right):
+    c0, c1, c2 = coeffs
+    scale = abs(c0) + abs(c1) + abs(c2)
+    if abs(c2) <= 1e-14 * scale:
+        roots = [] if abs(c1) <= 1e-14 * scale else [-c0 / c1]
+    else:
+        disc = c1 * c1 - 4 * c2 * c0
+        if disc < 0:
+            return []
+        # Устойчивая к сокращению форма корней квадратного уравнения
+        q = -0.5 * (c1 + np.copysign(np.sqrt(disc), c1))
+        roots = [q / c2, c0 / q] if q != 0 else [0.0]
+    return [root for root in roots if left < root < right]
+
+
+def critical_eps_2x2(family, right):
+    """Наименьшее eps из [0, right], при котором 0 попадает в интервал определителя 2x2.
+
+    Концы определителя - кусочно-квадратичные функции eps. Точки излома
+    (пересечения произведений концов) разбивают отрезок на куски, на каждом
+    из которых ищутся корни соответствующих квадратичных многочленов.
+    """
+    lower0, lower1, upper0, upper1 = family
+
+    def entry(i, j):
+        return (lower0[i, j], upper0[i, j]), (lower1[i, j], upper1[i, j])
+
+    P = _endpoint_products(*entry(0, 0), *entry(1, 1))
+    Q = _endpoint_products(*entry(0, 1), *entry(1, 0))
+
+    # Точки излома: eps, в которых меняется минимальное или максимальное произведение
+    breaks = [0.0, right]
+    for products in (P, Q):
+        for k in range(4):
+            for l in range(k + 1, 4):
+                breaks.extend(_real_roots(products[k] - products[l], 0.0, right))
+    breaks = np.unique(breaks)
+
+    def det_pieces(eps):
+        powers = np.array([1.0, eps, eps * eps])
+        p = P @ powers
+        q = Q @ powers
+        return P[np.argmin(p)] - Q[np.argmax(q)], P[np.argmax(p)] - Q[np.argmin(q)]
+
+    def zero_inside(eps):
+        low, up = det_pieces(eps)
+        powers = np.array([1.0, eps, eps * eps])
+        tol = 1e-12 * (1 + np.abs(low).sum() + np.abs(up).sum())
+        return low @ powers <= tol and up @ powers >= -tol
+
+    for left_break, right_break in zip(breaks[:-1], breaks[1:]):
+        if zero_inside(left_break):
+            return left_break
+        # Внутри куска концы определителя - фиксированные многочлены
+        low, up = det_pieces((left_break + right_break) / 2)
+        candidates = sorted(_real_roots(low, left_break, right_break) +
+                            _real_roots(up, left_break, right_break))
+        for eps in candidates:
+            if zero_inside(eps):
+                return eps
+    return right
+
+
+def critical_eps(get_matrix, right):
+    """Аналитический поиск критического eps; None, если замкнутой формы нет."""
+    matrix = as_interval_array(get_matrix(0.0))
+    if matrix.shape != (2, 2):
+        return None
+    family = affine_family(get_matrix, m0=matrix)
+    if family is None:
+        return None
+    return float(critical_eps_2x2(family, right))
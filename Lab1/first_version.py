@@ -1,5 +1,6 @@
 import numpy as np
-from interval_module import Interval
+from interval_module import Interval, IntervalArray
+from critical_eps import affine_family, as_interval_array
 
 # Генерация интервальной матрицы 2x2
 def get_interval_matrix(eps: float):
@@ -11,7 +12,7 @@ def intersect_intervals(ratios):
     item = ratios[0]
     for ratio in ratios[1:]:
         item = item & ratio
-        if item.lower == item.upper == 0:  # Если пересечение пустое
+        if item.is_empty():  # Если пересечение пустое
             return None
     return item
 
@@ -20,19 +21,19 @@ def intersect_intervals(ratios):
 def is_scalar(v1, v2) -> bool:
     ratios = []
     for i in range(len(v1)):
-        try:
-            ratio = v1[i] / v2[i]
-        except ZeroDivisionError:
+        ratio = v1[i] / v2[i]
+        # Деление на вырожденный нулевой интервал даёт пустое множество
+        if ratio.is_empty():
             return False
         ratios.append(ratio)
     return intersect_intervals(ratios) is not None
 
-def optimize(i, j, left, right, delta) -> (float, float):
+def optimize(i, j, left, right, delta, get_matrix=get_interval_matrix) -> (float, float):
     counter = 0
     while right - left > delta:
         c = (right + left) / 2
         counter += 1
-        matrix_tmp = get_interval_matrix(c)
+        matrix_tmp = get_matrix(c)
 
         v1, v2 = matrix_tmp[i], matrix_tmp[j]
 
@@ -45,24 +46,64 @@ def optimize(i, j, left, right, delta) -> (float, float):
     return right, left, counter
 
 
+def optimize_pairs(family, left, right, delta):
+    """Бисекция по eps сразу для всех пар строк (i, j), i < j.
+
+    Концы строк пар вычисляются из аффинного представления семейства
+    (см. affine_family) массивами формы (пары, столбцы), отношения строк
+    и их пересечение считаются одной векторной операцией на шаге.
+    Возвращает (right, left, counter) - массивы по одному значению на пару.
+    """
+    lower0, lower1, upper0, upper1 = family
+    rows_i, rows_j = np.triu_indices(len(lower0), 1)
+    left = np.full(len(rows_i), float(left))
+    right = np.full(len(rows_i), float(right))
+    counter = 0
+
+    active = right - left > delta
+    while active.any():
+        c = (right + left) / 2
+        counter += 1
+        eps = c[:, np.newaxis]
+        v1 = IntervalArray(lower0[rows_i] + lower1[rows_i] * eps, upper0[rows_i] + upper1[rows_i] * eps)
+        v2 = IntervalArray(lower0[rows_j] + lower1[rows_j] * eps, upper0[rows_j] + upper1[rows_j] * eps)
+        # Строки коллинеарны, если у всех отношений компонент есть общая точка
+        scalar = ~(v1 / v2).intersection(axis=1).is_empty()
+
+        right = np.where(active & scalar, c, right)
+        left = np.where(active & ~scalar, c, left)
+        active = right - left > delta
+    return right, left, counter
+
+
 # Основная функция оптимизации
-def determinant_optimization(matrix=None, delta=1e-5):
+def determinant_optimization(matrix=None, delta=1e-5, get_matrix=get_interval_matrix):
     if matrix is None:
-        matrix = get_interval_matrix(0)
+        matrix = get_matrix(0)
 
-    mid = find_max_middle(matrix)
+    mid = as_interval_array(matrix).mid().max()
     n = len(matrix)
 
     eps_curr = mid * 1.7 + 15
     eps_left_bound = 0
     counter = 1
+
+    # Все пары строк обрабатываются одновременно, ответ - минимум по парам
+    family = affine_family(get_matrix)
+    if family is not None:
+        eps_pairs, _, amount = optimize_pairs(family, eps_left_bound, eps_curr, delta)
+        print(f"Кол-во векторных шагов: {amount}")
+        return eps_pairs.min()
+
+    # Каждая пара делится пополам на своём отрезке [0, eps_curr], как в optimize_pairs
+    eps_pairs = []
     for i in range(n):
         for j in range(i + 1, n):  # Изменил цикл, чтобы j всегда > i
-            eps_curr, eps_left_bound, amount = optimize(i, j,
-                                                        eps_left_bound, eps_curr, delta)
+            eps_pair, _, amount = optimize(i, j, eps_left_bound, eps_curr, delta, get_matrix=get_matrix)
+            eps_pairs.append(eps_pair)
             counter += amount
     print(f"Кол-во вызовов функции: {counter + 1}")
-    return eps_curr
+    return min(eps_pairs)
 
 
 # for eps in [1e-1, 1e-2, 1e-3, 1e-14]:
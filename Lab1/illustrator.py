@@ -1,53 +1,144 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from interval_module import Interval
+from critical_eps import as_interval_array
 import numpy as np
 import os
 
 
-def illustrate_matrix(matrix, step_number, delta,folder_name="fmatrix"):
-    def draw_square(point, widths, step_number, color):
+def graphics_dir(folder_name):
+    base_dir = os.path.abspath(os.path.join(".", "Lab1/graphics"))
+    return os.path.join(base_dir, folder_name)
+
+
+# Рисование матрицы, заданной массивами концов, на осях ax
+def draw_matrix(ax, lower, upper, step_number, delta):
+    def draw_square(point, widths, color):
         x, y = point
         dx, dy = widths
         x_left = np.linspace(0, x - dx/2)
-        x_right = np.linspace(0, x + dx/2) 
+        x_right = np.linspace(0, x + dx/2)
         if dx == 0 or dy == 0:
-            plt.plot(x, y, 'o', color=color, markersize=10)
-            # plt.text(x, y, f"({x:.2f}, {y:.2f})", ha="center", va="center")
+            ax.plot(x, y, 'o', color=color, markersize=10)
             if dx == 0:
-                plt.plot([x, x], [y - dy / 2, y + dy / 2], color=color)
+                ax.plot([x, x], [y - dy / 2, y + dy / 2], color=color)
             else:
-                plt.plot([x - dx / 2, x + dx / 2], [y, y], color=color)
-                plt.plot(x - dx / 2, y, 'o', color=color)
-                plt.plot(x + dx / 2, y, 'o', color=color)
-                plt.plot(x_left, y/(x-dx/2) * x_left, color=color, linestyle='dashed')
-                plt.plot(x_right, y/(x+dx/2) * x_right, color=color, linestyle='dashed')
+                ax.plot([x - dx / 2, x + dx / 2], [y, y], color=color)
+                ax.plot(x - dx / 2, y, 'o', color=color)
+                ax.plot(x + dx / 2, y, 'o', color=color)
+                ax.plot(x_left, y/(x-dx/2) * x_left, color=color, linestyle='dashed')
+                ax.plot(x_right, y/(x+dx/2) * x_right, color=color, linestyle='dashed')
         else:
-            plt.gca().add_patch(plt.Rectangle((x - dx / 2, y - dy / 2), dx, dy,
-                                            edgecolor=color, facecolor=color,
-                                            alpha=0.3))
-            plt.plot(x_left, (2*y + dy)/(2*x-dx) * x_left, color=color, linestyle='dashed')
-            plt.plot(x_right, (2*y -dy)/(2*x+dx) * x_right, color=color, linestyle='dashed')
-
-    plt.figure(step_number, figsize=(16, 8))
-    colors = plt.cm.tab20(np.linspace(0, 1, 2 * len(matrix)))
-    matrix_t = matrix.transpose()
-    for i, row in enumerate(matrix_t):
-        point = [item.mid() for item in row]
-        plt.plot(point[0], point[1], 'o', color=colors[i])
-        draw_square(point, [item.width() for item in row], step_number, colors[i])
-
-    plt.grid()
-    plt.title(f"Step {step_number}, delta = {np.round(delta, 3)}")
+            ax.add_patch(plt.Rectangle((x - dx / 2, y - dy / 2), dx, dy,
+                                       edgecolor=color, facecolor=color,
+                                       alpha=0.3))
+            ax.plot(x_left, (2*y + dy)/(2*x-dx) * x_left, color=color, linestyle='dashed')
+            ax.plot(x_right, (2*y -dy)/(2*x+dx) * x_right, color=color, linestyle='dashed')
 
-    base_dir = os.path.abspath(os.path.join(".", "Lab1/graphics"))
-    path_info = os.path.join(base_dir, folder_name)
-    
+    colors = matplotlib.colormaps["tab20"](np.linspace(0, 1, 2 * len(lower)))
+    # Каждый столбец матрицы - точка (x, y) с прямоугольником неопределённости
+    mids, widths = ((lower + upper) / 2).T, (upper - lower).T
+    for i, (point, width) in enumerate(zip(mids, widths)):
+        ax.plot(point[0], point[1], 'o', color=colors[i])
+        draw_square(point, width, colors[i])
+
+    ax.grid()
+    ax.set_title(f"Step {step_number}, delta = {np.round(delta, 3)}")
+
+
+def illustrate_matrix(matrix, step_number, delta,folder_name="fmatrix"):
+    matrix = as_interval_array(matrix)
+    fig = plt.figure(step_number, figsize=(16, 8))
+    draw_matrix(fig.gca(), matrix.lower, matrix.upper, step_number, delta)
+
+    path_info = graphics_dir(folder_name)
     # Создаём папку, если её не существует
     os.makedirs(path_info, exist_ok=True)
     plt.savefig(f"{path_info}/step_{step_number}.png", dpi=200, bbox_inches='tight')
     plt.show()
 
 
+# Фигура рабочего процесса: создаётся один раз и переиспользуется между шагами
+_worker_figure = None
+
 
+def _init_render_worker():
+    matplotlib.use("Agg")
 
 
+def _render_snapshot(lower, upper, step_number, delta, path_info):
+    global _worker_figure
+    if _worker_figure is None:
+        _worker_figure = Figure(figsize=(16, 8))
+    _worker_figure.clf()
+    draw_matrix(_worker_figure.add_subplot(), lower, upper, step_number, delta)
+    os.makedirs(path_info, exist_ok=True)
+    path = f"{path_info}/step_{step_number}.png"
+    _worker_figure.savefig(path, dpi=200, bbox_inches='tight')
+    return path
+
+
+class RenderQueue:
+    """Фоновая отрисовка шагов бисекции в пуле процессов (бэкенд Agg).
+
+    Вызывающий код передаёт матрицу на каждом шаге через submit, в очередь
+    попадает только снимок концов. Пул создаётся при первой отправке рисунка.
+    Очередь сама решает, что рисовать: первые
+    first шагов отправляются в пул сразу, последние last шагов копятся и
+    отправляются при close. Если в работе уже max_pending рисунков, снимок
+    отбрасывается, поэтому submit никогда не ждёт Matplotlib.
+    """
+
+    def __init__(self, folder_name="fmatrix", first=2, last=2, processes=1, max_pending=8):
+        self.path_info = graphics_dir(folder_name)
+        self.first = first
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._submitted = 0
+        self._tail = deque(maxlen=last)
+        self._futures = []
+        self._processes = processes
+        self._pool = None
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _dispatch(self, snapshot):
+        if sum(not future.done() for future in self._futures) >= self.max_pending:
+            self.dropped += 1
+            return
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self._processes, initializer=_init_render_worker)
+        self._futures.append(self._pool.submit(_render_snapshot, *snapshot, self.path_info))
+
+    def submit(self, matrix, step_number, delta):
+        matrix = as_interval_array(matrix)
+        snapshot = (matrix.lower.copy(), matrix.upper.copy(), step_number, delta)
+        if self._submitted < self.first:
+            self._dispatch(snapshot)
+        else:
+            self._tail.append(snapshot)
+        self._submitted += 1
+
+    # Отправка накопленных последних шагов и ожидание всех рисунков
+    def close(self):
+        if self._closed:
+            return []
+        self._closed = True
+        self.max_pending += len(self._tail)
+        while self._tail:
+            self._dispatch(self._tail.popleft())
+        paths = [future.result() for future in self._futures]
+        self._futures = []
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        return paths
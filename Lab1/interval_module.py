@@ -1,13 +1,30 @@
+from contextlib import contextmanager
+
 import numpy as np
 
 class Interval:
+    # Концы хранятся как обычные float в слотах: без __dict__ и без
+    # временных массивов numpy в арифметике
+    __slots__ = ("lower", "upper")
+
     def __init__(self, lower, upper):
+        lower, upper = float(lower), float(upper)
         if lower > upper:
             raise ValueError("Lower bound cannot be greater than upper bound.")
         self.lower = lower
         self.upper = upper
 
+    # Пустой интервал: оба конца равны NaN
+    @classmethod
+    def empty(cls):
+        return _make(_NAN, _NAN)
+
+    def is_empty(self):
+        return self.lower != self.lower
+
     def __repr__(self):
+        if self.is_empty():
+            return "∅"
         return f"[{self.lower}, {self.upper}]"
 
     # Средняя точка интервала
@@ -21,40 +38,83 @@ class Interval:
     # Сложение интервалов
     def __add__(self, other):
         if isinstance(other, Interval):
-            return Interval(self.lower + other.lower, self.upper + other.upper)
-        return Interval(self.lower + other, self.upper + other)
+            return _make(self.lower + other.lower, self.upper + other.upper)
+        if isinstance(other, IntervalArray):
+            return NotImplemented
+        return _make(self.lower + other, self.upper + other)
+
+    __radd__ = __add__
 
     # Вычитание интервалов
     def __sub__(self, other):
         if isinstance(other, Interval):
-            return Interval(self.lower - other.upper, self.upper - other.lower)
-        return Interval(self.lower - other, self.upper - other)
+            return _make(self.lower - other.upper, self.upper - other.lower)
+        if isinstance(other, IntervalArray):
+            return NotImplemented
+        return _make(self.lower - other, self.upper - other)
 
-    # Умножение интервалов
+    def __rsub__(self, other):
+        return _make(other - self.upper, other - self.lower)
+
+    def __neg__(self):
+        return _make(-self.upper, -self.lower)
+
+    # Умножение интервалов по таблице знаков концов (9 случаев)
     def __mul__(self, other):
         if isinstance(other, Interval):
-            products = np.array([
-                self.lower * other.lower,
-                self.lower * other.upper,
-                self.upper * other.lower,
-                self.upper * other.upper
-            ])
-            return Interval(np.min(products), np.max(products))
-        return Interval(self.lower * other, self.upper * other)
+            return _mul(self.lower, self.upper, other.lower, other.upper)
+        if isinstance(other, IntervalArray):
+            return NotImplemented
+        if other >= 0:
+            return _make(self.lower * other, self.upper * other)
+        return _make(self.upper * other, self.lower * other)
 
-    # Деление интервалов
+    __rmul__ = __mul__
+
+    # Деление интервалов через умножение на обратный интервал; если делитель
+    # содержит ноль, возвращается оболочка результата расширенного деления
     def __truediv__(self, other):
         if isinstance(other, Interval):
-            # if other.lower <= 0 <= other.upper:
-            #     raise ZeroDivisionError("Interval includes zero, cannot divide.")
-            divisions = np.array([
-                self.lower / other.lower,
-                self.lower / other.upper,
-                self.upper / other.lower,
-                self.upper / other.upper
-            ])
-            return Interval(np.min(divisions), np.max(divisions))
-        return Interval(self.lower / other, self.upper / other)
+            c, d = other.lower, other.upper
+            if c > 0 or d < 0:
+                return _mul(self.lower, self.upper, 1.0 / d, 1.0 / c)
+            return _hull(self.extended_div(other))
+        if isinstance(other, IntervalArray):
+            return NotImplemented
+        if other == 0:
+            return Interval.empty()
+        return self * (1.0 / other)
+
+    def __rtruediv__(self, other):
+        return _make(other, other) / self
+
+    # Расширенное деление: результат - кортеж из не более чем двух интервалов.
+    # Соглашения те же, что у IntervalArray.div: деление на [0, 0] даёт пустое
+    # множество, [0, 0] / [c, d] = [0, 0], а 0 / 0 в остальных случаях не учитывается
+    def extended_div(self, other):
+        a, b = self.lower, self.upper
+        c, d = other.lower, other.upper
+        if self.is_empty() or other.is_empty():
+            return ()
+        if c > 0 or d < 0:
+            return (self / other,)
+        if c == d == 0:
+            return ()
+        if a == b == 0:
+            return (_make(0.0, 0.0),)
+        if a < 0 < b:
+            return (_make(-_INF, _INF),)
+        if b <= 0:
+            if d == 0:
+                return (_make(b / c, _INF),)
+            if c == 0:
+                return (_make(-_INF, b / d),)
+            return (_make(-_INF, b / d), _make(b / c, _INF))
+        if d == 0:
+            return (_make(-_INF, a / c),)
+        if c == 0:
+            return (_make(a / d, _INF),)
+        return (_make(-_INF, a / c), _make(a / d, _INF))
 
     # Принадлежность числа интервалу
     def __contains__(self, value):
@@ -62,12 +122,472 @@ class Interval:
 
     # Пересечение интервалов
     def __and__(self, other):
-        new_lower = max(self.lower, other.lower)
-        new_upper = min(self.upper, other.upper)
-        if new_lower > new_upper:
-            return Interval(0, 0)  # Возвращаем пустой интервал
-        return Interval(new_lower, new_upper)
+        if isinstance(other, IntervalArray):
+            return NotImplemented
+        new_lower = self.lower if self.lower > other.lower else other.lower
+        new_upper = self.upper if self.upper < other.upper else other.upper
+        # Для пустых операндов сравнение с NaN ложно, и результат тоже пуст
+        if new_lower <= new_upper:
+            return _make(new_lower, new_upper)
+        return Interval.empty()
 
     # Объединение интервалов
     def __or__(self, other):
-        return Interval(min(self.lower, other.lower), max(self.upper, other.upper))
+        if isinstance(other, IntervalArray):
+            return NotImplemented
+        if self.is_empty():
+            return other
+        if other.is_empty():
+            return self
+        return _make(min(self.lower, other.lower), max(self.upper, other.upper))
+
+
+_NAN = float("nan")
+_INF = float("inf")
+_new = object.__new__
+
+
+# Создание интервала без проверки и приведения концов (для результатов операций)
+def _make(lower, upper):
+    obj = _new(Interval)
+    obj.lower = lower
+    obj.upper = upper
+    return obj
+
+
+def _mul(a, b, c, d):
+    if a != a or c != c:
+        return Interval.empty()
+    if a >= 0:
+        if c >= 0:
+            lower, upper = a * c, b * d
+        elif d <= 0:
+            lower, upper = b * c, a * d
+        else:
+            lower, upper = b * c, b * d
+    elif b <= 0:
+        if c >= 0:
+            lower, upper = a * d, b * c
+        elif d <= 0:
+            lower, upper = b * d, a * c
+        else:
+            lower, upper = a * d, a * c
+    else:
+        if c >= 0:
+            lower, upper = a * d, b * d
+        elif d <= 0:
+            lower, upper = b * c, a * c
+        else:
+            ad, bc = a * d, b * c
+            ac, bd = a * c, b * d
+            lower = ad if ad < bc else bc
+            upper = ac if ac > bd else bd
+    # 0 * inf при бесконечных концах считаем нулём
+    if lower != lower or upper != upper:
+        products = [p if p == p else 0.0 for p in (a * c, a * d, b * c, b * d)]
+        lower, upper = min(products), max(products)
+    return _make(lower, upper)
+
+
+def _hull(intervals):
+    if not intervals:
+        return Interval.empty()
+    return _make(intervals[0].lower, intervals[-1].upper)
+
+
+# Режим проверенной арифметики (по умолчанию выключен)
+_verified_mode = {"enabled": False}
+
+
+@contextmanager
+def verified_arithmetic(enabled=True):
+    """Контекст, в котором операции IntervalArray округляют концы наружу."""
+    previous = _verified_mode["enabled"]
+    _verified_mode["enabled"] = enabled
+    try:
+        yield
+    finally:
+        _verified_mode["enabled"] = previous
+
+
+def _is_verified(verified):
+    return _verified_mode["enabled"] if verified is None else verified
+
+
+# Сдвиг концов на одну единицу последнего разряда наружу: результат гарантированно
+# содержит точный, так как ошибка округления IEEE 754 не превышает половины ulp
+def _round_out(lower, upper):
+    return np.nextafter(lower, -np.inf), np.nextafter(upper, np.inf)
+
+
+def _rounded(lower, upper, verified, floor=None):
+    if _is_verified(verified):
+        lower, upper = _round_out(lower, upper)
+        # Округление не должно выводить за заведомую нижнюю границу области значений
+        if floor is not None:
+            lower = np.maximum(lower, floor)
+    return IntervalArray._from_endpoints(lower, upper)
+
+
+# Пересечение с областью определения [bound, +inf): интервалы целиком левее
+# границы становятся пустыми, остальные обрезаются по ней
+def _clip_domain(lower, upper, bound):
+    outside = upper < bound
+    lower = np.maximum(lower, bound)
+    if np.any(outside):
+        lower = np.where(outside, np.nan, lower)
+        upper = np.where(outside, np.nan, upper)
+    return lower, upper
+
+
+# Натуральная степень: нечётная монотонна, чётная для интервала, содержащего
+# ноль, даёт [0, max(l^n, u^n)]
+def _int_pow_endpoints(lower, upper, n):
+    p_lower, p_upper = np.power(lower, n), np.power(upper, n)
+    if n % 2:
+        return p_lower, p_upper
+    straddle = (lower < 0) & (upper > 0)
+    new_lower = np.where(straddle, 0.0, np.minimum(p_lower, p_upper))
+    return new_lower, np.maximum(p_lower, p_upper)
+
+
+# Приведение операнда к паре массивов концов
+def _endpoints(other):
+    if isinstance(other, IntervalArray):
+        return other.lower, other.upper
+    if isinstance(other, Interval):
+        return np.float64(other.lower), np.float64(other.upper)
+    value = np.asarray(other, dtype=np.float64)
+    return value, value
+
+
+# Поэлементное произведение интервалов, заданных концами
+def _mul_endpoints(a_lower, a_upper, b_lower, b_upper):
+    with np.errstate(invalid="ignore"):
+        p1 = a_lower * b_lower
+        p2 = a_lower * b_upper
+        p3 = a_upper * b_lower
+        p4 = a_upper * b_upper
+    lower = np.minimum(np.minimum(p1, p2), np.minimum(p3, p4))
+    upper = np.maximum(np.maximum(p1, p2), np.maximum(p3, p4))
+
+    # NaN появляется либо у пустых интервалов, либо как 0 * inf,
+    # который в интервальной арифметике считается нулём
+    if np.isnan(lower).any():
+        empty = np.isnan(a_lower) | np.isnan(b_lower)
+        p1, p2, p3, p4 = (np.where(np.isnan(p), 0.0, p) for p in (p1, p2, p3, p4))
+        lower = np.where(empty, np.nan, np.minimum(np.minimum(p1, p2), np.minimum(p3, p4)))
+        upper = np.where(empty, np.nan, np.maximum(np.maximum(p1, p2), np.maximum(p3, p4)))
+    return lower, upper
+
+
+# Обратный интервал 1 / [lower, upper], в том числе для интервалов, содержащих ноль
+def _reciprocal_endpoints(lower, upper):
+    with np.errstate(divide="ignore"):
+        inv_lower = 1.0 / upper
+        inv_upper = 1.0 / lower
+    zero_in = (lower <= 0) & (upper >= 0)
+    if np.any(zero_in):
+        inv_lower = np.where(zero_in, np.where(lower < 0, -np.inf, inv_lower), inv_lower)
+        inv_upper = np.where(zero_in, np.where(upper > 0, np.inf, inv_upper), inv_upper)
+        # Деление на вырожденный нулевой интервал даёт пустое множество
+        point_zero = zero_in & (lower == upper)
+        inv_lower = np.where(point_zero, np.nan, inv_lower)
+        inv_upper = np.where(point_zero, np.nan, inv_upper)
+    return inv_lower, inv_upper
+
+
+def _matmul_endpoints(a_lower, a_upper, b_lower, b_upper, verified):
+    a_mid, a_rad = (a_lower + a_upper) / 2, (a_upper - a_lower) / 2
+    b_mid, b_rad = (b_lower + b_upper) / 2, (b_upper - b_lower) / 2
+    mid = a_mid @ b_mid
+    rad = np.abs(a_mid) @ b_rad + a_rad @ (np.abs(b_mid) + b_rad)
+    if _is_verified(verified):
+        # Погрешность округления в a_mid @ b_mid и в вычислении радиуса:
+        # |fl(A B) - A B| <= gamma_{n+2} |A| |B| + realmin
+        n = a_mid.shape[-1]
+        gamma = (n + 2) * np.finfo(np.float64).eps
+        error = gamma * (np.abs(a_mid) @ np.abs(b_mid)) + np.finfo(np.float64).tiny
+        rad = (rad + error) * (1 + gamma)
+        return _rounded(mid - rad, mid + rad, True)
+    return IntervalArray._from_endpoints(mid - rad, mid + rad)
+
+
+class IntervalArray:
+    """Массив интервалов, хранящий нижние и верхние концы в двух массивах float64.
+
+    Пустой интервал представляется парой концов NaN.
+    """
+    # Запрещаем numpy разбирать массив поэлементно: операции вида
+    # ndarray * IntervalArray передаются в __rmul__ и т.п.
+    __array_ufunc__ = None
+
+    def __init__(self, lower, upper=None):
+        lower = np.asarray(lower, dtype=np.float64)
+        upper = lower if upper is None else np.asarray(upper, dtype=np.float64)
+        lower, upper = np.broadcast_arrays(lower, upper)
+        if np.any(lower > upper):
+            raise ValueError("Lower bound cannot be greater than upper bound.")
+        self.lower = np.array(lower)
+        self.upper = np.array(upper)
+
+    # Создание без проверок и копирования (для результатов операций)
+    @classmethod
+    def _from_endpoints(cls, lower, upper):
+        obj = cls.__new__(cls)
+        obj.lower = np.asarray(lower, dtype=np.float64)
+        obj.upper = np.asarray(upper, dtype=np.float64)
+        return obj
+
+    @classmethod
+    def from_intervals(cls, matrix):
+        matrix = np.asarray(matrix, dtype=object)
+        lower = np.array([item.lower for item in matrix.flat], dtype=np.float64)
+        upper = np.array([item.upper for item in matrix.flat], dtype=np.float64)
+        return cls(lower.reshape(matrix.shape), upper.reshape(matrix.shape))
+
+    @classmethod
+    def from_mid_rad(cls, mid, rad):
+        mid = np.asarray(mid, dtype=np.float64)
+        rad = np.asarray(rad, dtype=np.float64)
+        return cls(mid - rad, mid + rad)
+
+    @classmethod
+    def empty(cls, shape):
+        return cls._from_endpoints(np.full(shape, np.nan), np.full(shape, np.nan))
+
+    # Обратное преобразование в массив объектов Interval
+    def to_intervals(self):
+        result = np.empty(self.shape, dtype=object)
+        for index in np.ndindex(self.shape):
+            result[index] = self[index]
+        return result
+
+    @property
+    def shape(self):
+        return self.lower.shape
+
+    @property
+    def ndim(self):
+        return self.lower.ndim
+
+    @property
+    def size(self):
+        return self.lower.size
+
+    def __len__(self):
+        return len(self.lower)
+
+    def __getitem__(self, key):
+        lower, upper = self.lower[key], self.upper[key]
+        if np.ndim(lower) == 0:
+            if lower != lower:
+                return Interval.empty()
+            return Interval(float(lower), float(upper))
+        return IntervalArray._from_endpoints(lower, upper)
+
+    def __setitem__(self, key, value):
+        lower, upper = _endpoints(value)
+        self.lower[key] = lower
+        self.upper[key] = upper
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self):
+        return f"IntervalArray(lower={self.lower!r}, upper={self.upper!r})"
+
+    def copy(self):
+        return IntervalArray._from_endpoints(self.lower.copy(), self.upper.copy())
+
+    def reshape(self, *shape):
+        return IntervalArray._from_endpoints(self.lower.reshape(*shape), self.upper.reshape(*shape))
+
+    def transpose(self, *axes):
+        return IntervalArray._from_endpoints(self.lower.transpose(*axes), self.upper.transpose(*axes))
+
+    @property
+    def T(self):
+        return self.transpose()
+
+    def is_empty(self):
+        return np.isnan(self.lower)
+
+    # Средние точки интервалов
+    def mid(self):
+        return (self.lower + self.upper) / 2
+
+    # Ширины интервалов
+    def width(self):
+        return self.upper - self.lower
+
+    # Радиусы интервалов
+    def rad(self):
+        return (self.upper - self.lower) / 2
+
+    # Арифметика; verified=True включает направленное наружу округление концов,
+    # verified=None берёт режим из контекста verified_arithmetic
+    def add(self, other, verified=None):
+        lower, upper = _endpoints(other)
+        return _rounded(self.lower + lower, self.upper + upper, verified)
+
+    def sub(self, other, verified=None):
+        lower, upper = _endpoints(other)
+        return _rounded(self.lower - upper, self.upper - lower, verified)
+
+    def mul(self, other, verified=None):
+        lower, upper = _endpoints(other)
+        return _rounded(*_mul_endpoints(self.lower, self.upper, lower, upper), verified)
+
+    # Деление; при делителе, содержащем ноль, результат охватывает
+    # все значения расширенного деления
+    def div(self, other, verified=None):
+        lower, upper = _endpoints(other)
+        inv_lower, inv_upper = _reciprocal_endpoints(lower, upper)
+        if _is_verified(verified):
+            inv_lower, inv_upper = _round_out(inv_lower, inv_upper)
+        return _rounded(*_mul_endpoints(self.lower, self.upper, inv_lower, inv_upper), verified)
+
+    # Сложение интервалов
+    def __add__(self, other):
+        return self.add(other)
+
+    __radd__ = __add__
+
+    # Вычитание интервалов
+    def __sub__(self, other):
+        return self.sub(other)
+
+    def __rsub__(self, other):
+        lower, upper = _endpoints(other)
+        return _rounded(lower - self.upper, upper - self.lower, None)
+
+    def __neg__(self):
+        return IntervalArray._from_endpoints(-self.upper, -self.lower)
+
+    # Умножение интервалов
+    def __mul__(self, other):
+        return self.mul(other)
+
+    __rmul__ = __mul__
+
+    # Деление интервалов
+    def __truediv__(self, other):
+        return self.div(other)
+
+    def __rtruediv__(self, other):
+        lower, upper = _endpoints(other)
+        return IntervalArray._from_endpoints(lower, upper).div(self)
+
+    # Матричное произведение в форме середина-радиус (Rump): несколько вызовов
+    # BLAS вместо O(n^3) интервальных умножений. Оценка может быть шире
+    # точного произведения не более чем в 1.5 раза
+    def matmul(self, other, verified=None):
+        return _matmul_endpoints(self.lower, self.upper, *_endpoints(other), verified)
+
+    def __matmul__(self, other):
+        return self.matmul(other)
+
+    def __rmatmul__(self, other):
+        return _matmul_endpoints(*_endpoints(other), self.lower, self.upper, None)
+
+    # Элементарные функции: один проход numpy по массивам концов.
+    # Монотонные функции применяются к концам, аргумент предварительно
+    # пересекается с областью определения
+    def abs(self):
+        lower = np.where(self.lower >= 0, self.lower,
+                         np.where(self.upper <= 0, -self.upper, 0.0))
+        upper = np.maximum(np.abs(self.lower), np.abs(self.upper))
+        return IntervalArray._from_endpoints(lower, upper)
+
+    __abs__ = abs
+
+    def sqrt(self, verified=None):
+        lower, upper = _clip_domain(self.lower, self.upper, 0.0)
+        return _rounded(np.sqrt(lower), np.sqrt(upper), verified, floor=0.0)
+
+    def exp(self, verified=None):
+        return _rounded(np.exp(self.lower), np.exp(self.upper), verified, floor=0.0)
+
+    # Натуральный логарифм; интервал, касающийся нуля, даёт нижний конец -inf
+    def log(self, verified=None):
+        lower, upper = _clip_domain(self.lower, self.upper, 0.0)
+        with np.errstate(divide="ignore"):
+            lower, upper = np.log(lower), np.log(upper)
+        # [0, 0] не пересекается с областью определения (0, +inf)
+        point_zero = upper == -np.inf
+        if np.any(point_zero):
+            lower = np.where(point_zero, np.nan, lower)
+            upper = np.where(point_zero, np.nan, upper)
+        return _rounded(lower, upper, verified)
+
+    # Степень с целым или вещественным показателем; нецелый показатель
+    # определён только для неотрицательного аргумента
+    def pow(self, exponent, verified=None):
+        exponent = float(exponent)
+        if exponent == 0:
+            one = np.where(np.isnan(self.lower), np.nan, 1.0)
+            return IntervalArray._from_endpoints(one, one.copy())
+        if exponent.is_integer():
+            n = int(exponent)
+            lower, upper = _int_pow_endpoints(self.lower, self.upper, abs(n))
+            floor = 0.0 if n % 2 == 0 else None
+            # Отрицательная степень - обратная к положительной, как в div
+            if n < 0:
+                if _is_verified(verified):
+                    lower, upper = _round_out(lower, upper)
+                    if floor is not None:
+                        lower = np.maximum(lower, floor)
+                lower, upper = _reciprocal_endpoints(lower, upper)
+        else:
+            lower, upper = _clip_domain(self.lower, self.upper, 0.0)
+            with np.errstate(divide="ignore"):
+                lower, upper = np.power(lower, exponent), np.power(upper, exponent)
+            if exponent < 0:
+                lower, upper = upper, lower
+            floor = 0.0
+        return _rounded(lower, upper, verified, floor=floor)
+
+    def __pow__(self, exponent):
+        return self.pow(exponent)
+
+    # Пересечение интервалов
+    def __and__(self, other):
+        lower, upper = _endpoints(other)
+        new_lower = np.maximum(self.lower, lower)
+        new_upper = np.minimum(self.upper, upper)
+        disjoint = new_lower > new_upper
+        if np.any(disjoint):
+            new_lower = np.where(disjoint, np.nan, new_lower)
+            new_upper = np.where(disjoint, np.nan, new_upper)
+        return IntervalArray._from_endpoints(new_lower, new_upper)
+
+    __rand__ = __and__
+
+    # Объединение интервалов (интервальная оболочка); пустые операнды игнорируются
+    def __or__(self, other):
+        lower, upper = _endpoints(other)
+        return IntervalArray._from_endpoints(np.fmin(self.lower, lower), np.fmax(self.upper, upper))
+
+    __ror__ = __or__
+
+    # Принадлежность точек интервалам либо вложение интервалов
+    def contains(self, value):
+        if isinstance(value, (Interval, IntervalArray)):
+            lower, upper = _endpoints(value)
+            return np.isnan(lower) | ((self.lower <= lower) & (upper <= self.upper))
+        value = np.asarray(value, dtype=np.float64)
+        return (self.lower <= value) & (value <= self.upper)
+
+    # Пересечение и оболочка всех интервалов массива вдоль оси
+    def intersection(self, axis=None):
+        lower = np.max(self.lower, axis=axis)
+        upper = np.min(self.upper, axis=axis)
+        disjoint = lower > upper
+        return IntervalArray._from_endpoints(np.where(disjoint, np.nan, lower),
+                                             np.where(disjoint, np.nan, upper))
+
+    def hull(self, axis=None):
+        return IntervalArray._from_endpoints(np.fmin.reduce(self.lower, axis=axis),
+                                             np.fmax.reduce(self.upper, axis=axis))
@@ -0,0 +1,127 @@
+import numpy as np
+
+from interval_module import IntervalArray, verified_arithmetic, _is_verified
+from critical_eps import as_interval_array
+
+
+def _as_rhs(b):
+    if isinstance(b, IntervalArray):
+        return b
+    b = np.asarray(b)
+    if b.dtype == object:
+        return IntervalArray.from_intervals(b)
+    return IntervalArray(b, b)
+
+
+# Мигнитуда и магнитуда массива интервалов
+def _mig(x):
+    return np.where((x.lower > 0) | (x.upper < 0), np.minimum(np.abs(x.lower), np.abs(x.upper)), 0.0)
+
+
+def _mag(x):
+    return np.maximum(np.abs(x.lower), np.abs(x.upper))
+
+
+def precondition(A, b):
+    """Предобусловливание обратной к средней матрицей: (R A, R b, R)."""
+    R = np.linalg.inv(A.mid())
+    return R @ A, R @ b, R
+
+
+def hansen_bliek_rohn(A, b):
+    """Оценка объединённого множества решений для H-матрицы A (форма Нинга-Керфотта
+    теоремы Хансена-Блика-Рона).
+
+    Для u = <A>^-1 |b|, d_i = (<A>^-1)_ii, alpha_i = <A>_ii - 1/d_i,
+    beta_i = u_i / d_i - |b_i| решение лежит в
+    x_i = (b_i + [-beta_i, beta_i]) / (A_ii + [-alpha_i, alpha_i]).
+    Правая часть может быть матрицей n x k: все столбцы используют одну <A>^-1.
+    """
+    n = A.shape[0]
+    diag = IntervalArray._from_endpoints(np.diagonal(A.lower).copy(), np.diagonal(A.upper).copy())
+    comparison = -_mag(A)
+    comparison[np.diag_indices(n)] = _mig(diag)
+    try:
+        comparison_inv = np.linalg.inv(comparison)
+    except np.linalg.LinAlgError:
+        comparison_inv = None
+    if comparison_inv is None or np.any(comparison_inv < -1e-12 * np.abs(comparison_inv).max()):
+        raise ValueError("Matrix is not an H-matrix; the Hansen-Bliek-Rohn enclosure does not apply.")
+
+    mag_b = _mag(b)
+    d = np.diagonal(comparison_inv)
+    u = comparison_inv @ mag_b
+    alpha = np.diagonal(comparison) - 1 / d
+    if b.ndim == 2:
+        d, alpha, diag = d[:, np.newaxis], alpha[:, np.newaxis], diag.reshape(n, 1)
+    beta = u / d - mag_b
+    return (b + IntervalArray._from_endpoints(-beta, beta)) / (diag + IntervalArray._from_endpoints(-alpha, alpha))
+
+
+def _total_width(x):
+    return np.sum(x.width())
+
+
+def krawczyk(A, b, x, max_iter=20, rtol=1e-3, R=None):
+    """Уточнение оценки x итерациями Кравчика
+    K(x) = x~ + R (b - A x~) + (I - R A)(x - x~), x <- K(x) & x.
+
+    R - приближённая обратная к mid(A), по умолчанию вычисляется заново.
+    Итерации прекращаются, когда суммарная ширина уменьшается меньше, чем в rtol раз.
+    Возвращает (x, число итераций).
+    """
+    if R is None:
+        R = np.linalg.inv(A.mid())
+    residual_matrix = np.eye(A.shape[0]) - R @ A
+    width = _total_width(x)
+    for iteration in range(1, max_iter + 1):
+        x_mid = x.mid()
+        x = (x_mid + R @ (b - A @ x_mid) + residual_matrix @ (x - x_mid)) & x
+        new_width = _total_width(x)
+        if not width - new_width > rtol * width:
+            return x, iteration
+        width = new_width
+    return x, max_iter
+
+
+def gauss_seidel(A, b, x, max_iter=20, rtol=1e-3):
+    """Интервальный метод Гаусса-Зейделя для предобусловленной системы A x = b:
+    x_i <- ((b_i - sum_{j != i} A_ij x_j) / A_ii) & x_i. Возвращает (x, число итераций)."""
+    n = A.shape[0]
+    off_diag = A.copy()
+    off_diag.lower[np.diag_indices(n)] = 0.0
+    off_diag.upper[np.diag_indices(n)] = 0.0
+    x = x.copy()
+    width = _total_width(x)
+    for iteration in range(1, max_iter + 1):
+        for i in range(n):
+            x[i] = ((b[i] - off_diag[i] @ x) / A[i, i]) & x[i]
+        new_width = _total_width(x)
+        if not width - new_width > rtol * width:
+            return x, iteration
+        width = new_width
+    return x, max_iter
+
+
+def solve_enclosure(A, b, refine="krawczyk", max_iter=20, rtol=1e-3, verified=None):
+    """Внешняя оценка объединённого множества решений интервальной системы A x = b.
+
+    Система предобусловливается обратной к средней матрицей, начальная оценка
+    строится по Хансену-Блику-Рону и при необходимости уточняется методом
+    Кравчика (refine="krawczyk") или Гаусса-Зейделя (refine="gauss-seidel").
+    b может быть вектором или матрицей n x k правых частей - предобусловливатель
+    и <A>^-1 вычисляются один раз для всех столбцов. verified=None - режим
+    округления наружу берётся из verified_arithmetic.
+    """
+    A = as_interval_array(A)
+    b = _as_rhs(b)
+    with verified_arithmetic(_is_verified(verified)):
+        A_pre, b_pre, R = precondition(A, b)
+        x = hansen_bliek_rohn(A_pre, b_pre)
+        if refine == "krawczyk":
+            x, _ = krawczyk(A, b, x, max_iter=max_iter, rtol=rtol, R=R)
+        elif refine == "gauss-seidel":
+            x, _ = gauss_seidel(A_pre, b_pre, x, max_iter=max_iter, rtol=rtol)
+        elif refine is not None:
+            raise ValueError(f"Unknown refinement: {refine}")
+    return x
@@ -4,4 +4,5 @@ def lab1():
 
     pass
 
-lab1()
\ No newline at end of file
+if __name__ == "__main__":
+    lab1()
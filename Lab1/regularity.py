@@ -0,0 +1,183 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from interval_module import Interval
+from critical_eps import as_interval_array
+
+
+def _center_radius(matrix):
+    matrix = as_interval_array(matrix)
+    return matrix.mid(), matrix.rad()
+
+
+def determinant_enclosure(matrix, precondition=True):
+    """Оценка определителя n x n интервальной матрицы методом Гаусса.
+
+    Исключение ведётся с выбором ведущего элемента по наибольшей мигнитуде.
+    При precondition=True матрица предварительно умножается на обратную
+    к средней, так что det(A) = det(R A) * det(mid A), а R A близка к единичной
+    и интервальный метод Гаусса не раздувает оценку.
+    Если ведущий элемент содержит ноль, возвращается (-inf, inf).
+    """
+    A = as_interval_array(matrix).copy()
+    n = A.shape[0]
+    scale = Interval(1.0, 1.0)
+
+    if precondition:
+        center = A.mid()
+        det_center = np.linalg.det(center)
+        if det_center == 0:
+            return Interval(-np.inf, np.inf)
+        A = np.linalg.inv(center) @ A
+        scale = Interval(det_center, det_center)
+
+    det = Interval(1.0, 1.0)
+    for k in range(n):
+        lower, upper = A.lower[k:, k], A.upper[k:, k]
+        mignitude = np.where((lower > 0) | (upper < 0), np.minimum(np.abs(lower), np.abs(upper)), 0.0)
+        p = k + int(np.argmax(mignitude))
+        if mignitude[p - k] == 0:
+            return Interval(-np.inf, np.inf)
+        if p != k:
+            A.lower[[k, p]] = A.lower[[p, k]]
+            A.upper[[k, p]] = A.upper[[p, k]]
+            det = -det
+        pivot = A[k, k]
+        det = det * pivot
+        if k + 1 < n:
+            factors = A[k + 1:, k] / pivot
+            A[k + 1:, k + 1:] = A[k + 1:, k + 1:] - factors.reshape(-1, 1) * A[k, k + 1:].reshape(1, -1)
+    return det * scale
+
+
+def beeck_condition(matrix):
+    """Достаточное условие Бека: rho(|mid(A)^-1| rad(A)) < 1 => A регулярна."""
+    center, radius = _center_radius(matrix)
+    try:
+        inverse = np.linalg.inv(center)
+    except np.linalg.LinAlgError:
+        return False
+    return np.max(np.abs(np.linalg.eigvals(np.abs(inverse) @ radius))) < 1
+
+
+def rohn_singularity_condition(matrix):
+    """Достаточные условия особенности по Рону.
+
+    Проверяется max_j (rad(A) |mid(A)^-1|)_jj >= 1, а также вершинная матрица
+    mid(A) - T_y rad(A) T_z со знаковыми векторами y, z сингулярных векторов
+    mid(A) для наименьшего сингулярного числа: если знак её определителя
+    отличается от знака det(mid(A)), матрица особенная.
+    """
+    center, radius = _center_radius(matrix)
+    try:
+        inverse = np.linalg.inv(center)
+    except np.linalg.LinAlgError:
+        return True
+    if np.max(np.diag(radius @ np.abs(inverse))) >= 1:
+        return True
+
+    u, _, vt = np.linalg.svd(center)
+    y, z = np.where(u[:, -1] >= 0, 1.0, -1.0), np.where(vt[-1] >= 0, 1.0, -1.0)
+    vertex = center - y[:, np.newaxis] * radius * z[np.newaxis, :]
+    return np.sign(np.linalg.det(vertex)) != np.sign(np.linalg.det(center))
+
+
+# Знаки определителей вершинных матриц mid(A) - T_y rad(A) T_z для номеров [start, stop)
+def _vertex_signs(center, radius, start, stop):
+    n = len(center)
+    k = np.arange(start, stop, dtype=np.int64)
+    bits = (k[:, np.newaxis] >> np.arange(2 * n - 1)) & 1
+    y = 1 - 2 * bits[:, :n]
+    # Пары (y, z) и (-y, -z) дают одну и ту же матрицу, поэтому z_1 = 1
+    z = np.concatenate([np.ones((len(k), 1), dtype=np.int64), 1 - 2 * bits[:, n:]], axis=1)
+    dets = np.linalg.det(center - y[:, :, np.newaxis] * radius * z[:, np.newaxis, :])
+    return bool(np.any(dets > 0)), bool(np.any(dets < 0)), bool(np.any(dets == 0))
+
+
+# Наибольший порядок для перебора вершин: 2^(2n-1) матриц при n = 16 - уже 2^31
+MAX_VERTEX_N = 16
+
+
+def vertex_regularity(matrix, processes=None, chunk_size=1 << 14, max_n=MAX_VERTEX_N):
+    """Критерий Рона: A регулярна тогда и только тогда, когда определители всех
+    вершинных матриц mid(A) - T_y rad(A) T_z, y, z из {-1, 1}^n, одного знака.
+
+    Перебирается 2^(2n-1) матриц, поэтому проверка применима лишь для малых n:
+    при n > max_n выдаётся ValueError (номера вершин должны помещаться в int64,
+    max_n не больше 31); при processes > 1 блоки вершин распределяются по пулу процессов.
+    """
+    center, radius = _center_radius(matrix)
+    n = len(center)
+    if n > min(max_n, 31):
+        raise ValueError(f"Vertex enumeration needs 2^{2 * n - 1} matrices for n = {n}; "
+                         f"it is limited to n <= {min(max_n, 31)}. Use strategy='auto'.")
+    total = 1 << (2 * n - 1)
+    chunks = [(start, min(start + chunk_size, total)) for start in range(0, total, chunk_size)]
+
+    positive = negative = False
+    if processes is None or processes <= 1:
+        for start, stop in chunks:
+            pos, neg, zero = _vertex_signs(center, radius, start, stop)
+            positive, negative = positive or pos, negative or neg
+            if zero or (positive and negative):
+                return False
+        return True
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(_vertex_signs, center, radius, start, stop) for start, stop in chunks]
+        for future in futures:
+            pos, neg, zero = future.result()
+            positive, negative = positive or pos, negative or neg
+            if zero or (positive and negative):
+                for rest in futures:
+                    rest.cancel()
+                return False
+    return True
+
+
+def is_regular(matrix, strategy="auto", processes=None, max_vertex_n=8):
+    """Проверка регулярности интервальной матрицы.
+
+    strategy: "gauss", "beeck", "vertex" или "auto". В режиме "auto" проверки
+    выполняются от самой дешёвой к самой дорогой до первого определённого ответа.
+    Возвращает (результат, метод), где результат - True, False или None,
+    если ни одна из применённых проверок не дала ответа.
+    """
+    matrix = as_interval_array(matrix)
+    if strategy == "gauss":
+        return (0 not in determinant_enclosure(matrix)) or None, "gauss"
+    if strategy == "beeck":
+        return beeck_condition(matrix) or None, "beeck"
+    if strategy == "vertex":
+        return vertex_regularity(matrix, processes=processes), "vertex"
+    if strategy != "auto":
+        raise ValueError(f"Unknown strategy: {strategy}")
+
+    if beeck_condition(matrix):
+        return True, "beeck"
+    if rohn_singularity_condition(matrix):
+        return False, "rohn"
+    if 0 not in determinant_enclosure(matrix):
+        return True, "gauss"
+    if matrix.shape[0] <= min(max_vertex_n, MAX_VERTEX_N):
+        return vertex_regularity(matrix, processes=processes), "vertex"
+    return None, "undecided"
+
+
+def singularity_radius(get_matrix, left, right, delta, strategy="auto", processes=None):
+    """Бисекция по eps с проверкой регулярности вместо определителя 2x2.
+
+    Неопределённый ответ считается особенностью, поэтому результат - оценка
+    радиуса регулярности снизу. Возвращает (right, left, counter), как optimize.
+    """
+    counter = 0
+    while right - left > delta:
+        c = (right + left) / 2
+        counter += 1
+        regular, _ = is_regular(get_matrix(c), strategy=strategy, processes=processes)
+        if regular:
+            left = c
+        else:
+            right = c
+    return right, left, counter
@@ -0,0 +1,123 @@
+import json
+import os
+
+import numpy as np
+
+from critical_eps import as_interval_array
+
+
+class StepTrace:
+    """Числовой протокол шагов бисекции.
+
+    Для каждого шага хранятся номер, eps, границы [left, right] и концы
+    интервала определителя, при store_matrix=True - ещё и концы матрицы.
+    Записи кладутся в заранее выделенные массивы (при переполнении ёмкость
+    удваивается), а LaTeX и консольный вывод строятся из протокола по запросу.
+    """
+    FIELDS = ("step", "eps", "left", "right", "det_lower", "det_upper")
+
+    def __init__(self, capacity=64, store_matrix=False, matrix_shape=(2, 2)):
+        self.store_matrix = store_matrix
+        self.size = 0
+        self._data = np.empty((capacity, len(self.FIELDS)))
+        self._lower = np.empty((capacity, *matrix_shape)) if store_matrix else None
+        self._upper = np.empty((capacity, *matrix_shape)) if store_matrix else None
+
+    def __len__(self):
+        return self.size
+
+    def _grow(self):
+        self._data = np.concatenate([self._data, np.empty_like(self._data)])
+        if self.store_matrix:
+            self._lower = np.concatenate([self._lower, np.empty_like(self._lower)])
+            self._upper = np.concatenate([self._upper, np.empty_like(self._upper)])
+
+    def record(self, step, eps, left, right, interval, matrix=None):
+        if self.size == len(self._data):
+            self._grow()
+        self._data[self.size] = (step, eps, left, right, interval.lower, interval.upper)
+        if self.store_matrix and matrix is not None:
+            matrix = as_interval_array(matrix)
+            self._lower[self.size] = matrix.lower
+            self._upper[self.size] = matrix.upper
+        self.size += 1
+
+    def __getitem__(self, field):
+        return self._data[:self.size, self.FIELDS.index(field)]
+
+    def matrix(self, index):
+        return self._lower[index], self._upper[index]
+
+    # Сохранение протокола: .npz или .jsonl (по расширению)
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if path.endswith(".jsonl"):
+            with open(path, "w", encoding="utf-8") as file:
+                for i in range(self.size):
+                    record = dict(zip(self.FIELDS, self._data[i].tolist()))
+                    record["step"] = int(record["step"])
+                    if self.store_matrix:
+                        record["lower"] = self._lower[i].tolist()
+                        record["upper"] = self._upper[i].tolist()
+                    file.write(json.dumps(record) + "\n")
+            return
+        arrays = {"data": self._data[:self.size]}
+        if self.store_matrix:
+            arrays.update(lower=self._lower[:self.size], upper=self._upper[:self.size])
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        if path.endswith(".jsonl"):
+            with open(path, encoding="utf-8") as file:
+                records = [json.loads(line) for line in file if line.strip()]
+            data = np.array([[record[field] for field in cls.FIELDS] for record in records]).reshape(-1, len(cls.FIELDS))
+            lower = np.array([record["lower"] for record in records]) if records and "lower" in records[0] else None
+            upper = np.array([record["upper"] for record in records]) if lower is not None else None
+        else:
+            with np.load(path) as archive:
+                data = archive["data"]
+                lower = archive["lower"] if "lower" in archive else None
+                upper = archive["upper"] if "upper" in archive else None
+
+        trace = cls(capacity=max(len(data), 1), store_matrix=lower is not None,
+                    matrix_shape=lower.shape[1:] if lower is not None else (2, 2))
+        trace._data[:len(data)] = data
+        if lower is not None:
+            trace._lower[:len(data)] = lower
+            trace._upper[:len(data)] = upper
+        trace.size = len(data)
+        return trace
+
+    def _matrix_latex(self, index):
+        lower, upper = self.matrix(index)
+        step = int(self._data[index, 0])
+        res = "\\begin{equation}\n\\text A_%d = \\begin{pmatrix}\n\t" % step
+        res += "\t".join(["&".join(f"[{float(l)}, {float(u)}]" for l, u in zip(row_l, row_u)) + "\\\\\n"
+                          for row_l, row_u in zip(lower, upper)])
+        res += "\\end{pmatrix}\n\\end{equation}"
+        return res
+
+    # LaTeX-описание шагов в формате generate_step_info
+    def to_latex(self, indices=None):
+        indices = range(self.size) if indices is None else indices
+        info = []
+        for i in indices:
+            step, eps, left, right, det_lower, det_upper = self._data[i]
+            text = f"$\\delta = {eps}$\nNumber: {int(step)}:"
+            if self.store_matrix:
+                text += f"\n{self._matrix_latex(i)}"
+            text += f"\nИтоговый интервал из определителя [{det_lower}, {det_upper}]"
+            text += f"\n$\\delta \\in $ [{left}, {right}]"
+            info.append(text)
+        return info
+
+    # Консольная таблица шагов
+    def to_console(self, indices=None):
+        indices = range(self.size) if indices is None else indices
+        lines = [f"{'step':>5} {'eps':>22} {'left':>22} {'right':>22} {'det':>45}"]
+        for i in indices:
+            step, eps, left, right, det_lower, det_upper = self._data[i]
+            lines.append(f"{int(step):>5} {eps:>22.15g} {left:>22.15g} {right:>22.15g} "
+                         f"{f'[{det_lower:.6g}, {det_upper:.6g}]':>45}")
+        return "\n".join(lines)
@@ -1,6 +1,9 @@
 import numpy as np
 from interval_module import Interval
-from illustrator import illustrate_matrix
+from illustrator import RenderQueue
+from critical_eps import critical_eps
+from regularity import determinant_enclosure, singularity_radius
+from step_trace import StepTrace
 import os
 
 
@@ -30,7 +33,9 @@ def find_max_middle(matrix):
 
 
 def determ(i, j, matrix):
-    return matrix[0][0] * matrix[1][1] - matrix[0][1] * matrix[1][0]
+    if len(matrix) == 2:
+        return matrix[0][0] * matrix[1][1] - matrix[0][1] * matrix[1][0]
+    return determinant_enclosure(matrix)
 
 def save_step_info(info: list[str], folder_name="fmatrix"):
     # Получаем абсолютный путь к папке, где будет сохранён файл
@@ -57,64 +62,90 @@ def generate_step_info(matrix, step_number, delta, interval, left_bound, right_b
     f"\nИтоговый интервал из определителя {interval}"+\
     f"\n$\\delta \\in $ [{left_bound}, {right_bound}]"
 
-def optimize(left, right, delta, get_matrix = get_interval_matrix, folder_name="fmatrix") -> (float, float):
+def optimize(left, right, delta, get_matrix = get_interval_matrix, folder_name="fmatrix",
+             renderer=None, trace=None, render=False) -> (float, float):
+    # Шаги рисуются только по запросу: через переданную очередь или при render=True.
+    # Какие шаги рисовать, решает очередь отрисовки (первые и последние шаги)
+    own_renderer = renderer is None and render
+    if own_renderer:
+        renderer = RenderQueue(folder_name=folder_name)
+    # Шаги пишутся в числовой протокол, LaTeX собирается только в конце
+    if trace is None:
+        trace = StepTrace(store_matrix=True, matrix_shape=np.shape(get_matrix(left)))
     counter = 0
     counter_left = 0
     counter_right = 0
-    info_steps = []
-    trace = "-" * 20 + "\n" + "-" * 20
+    report_steps = []
     while right - left > delta:
         c = (right + left) / 2
         counter += 1
         matrix_tmp = get_matrix(c)
         interval = determ(0, 0, matrix_tmp)
+        if renderer is not None:
+            renderer.submit(matrix_tmp, step_number=counter, delta=c)
+        trace.record(counter, c, left, right, interval, matrix_tmp)
         if not 0 in interval:
             if counter_left < 2:
-                step_info = generate_step_info(matrix_tmp, counter, c, interval, left_bound=left, right_bound=right)
-                info_steps.append(step_info)
-                print(trace + "\nСдвиг влево:\n" + trace + "\n" + step_info)
-                illustrate_matrix(matrix=matrix_tmp, step_number=counter, folder_name=folder_name, delta=c)
+                report_steps.append(len(trace) - 1)
             counter_left += 1
             left = c
         else:
-            
             if counter_right < 2:
-                step_info = generate_step_info(matrix_tmp, counter, c, interval, left_bound=left, right_bound=right)
-                info_steps.append(step_info)
-                print(trace + "\nСдвиг вправо:\n" + trace + "\n" + step_info)
-                illustrate_matrix(matrix=matrix_tmp, step_number=counter, folder_name=folder_name, delta=c)
+                report_steps.append(len(trace) - 1)
             counter_right += 1
             right = c
 
-    info_steps.append(generate_step_info(matrix_tmp, counter, c, interval, left_bound=left, right_bound=right))
+    trace.record(counter, c, left, right, interval, matrix_tmp)
+    report_steps.append(len(trace) - 1)
     print("-" * 20)
-    print(f"$\\delta = {c}$")
-    print(f"Number: {counter}:\n{print_matrix_for_latex(matrix_tmp, counter)}"
-        f"\nИтоговый интервал из определителя{interval}")
-    illustrate_matrix(matrix=matrix_tmp, step_number=counter, folder_name=folder_name, delta=c)
+    print(trace.to_console(report_steps))
+    if own_renderer:
+        renderer.close()
+
+    save_step_info(trace.to_latex(report_steps), folder_name=folder_name)
+    trace.save(os.path.join(os.path.abspath("Lab1/step_info"), folder_name, "trace.npz"))
 
-    save_step_info(info_steps, folder_name=folder_name)
-    
     return right, left, counter
 
 
-def determinant_optimization_new(matrix=None, delta=1e-5, get_matrix = get_interval_matrix, folder_name="fmatrix"):
+def determinant_optimization_new(matrix=None, delta=1e-5, get_matrix = get_interval_matrix, folder_name="fmatrix",
+                                 method="analytic", render=False):
     if matrix is None:
-        matrix = get_interval_matrix(0)
+        matrix = get_matrix(0)
 
     mid = find_max_middle(matrix)
 
     eps_curr = mid
+
+    # Точное решение через корни кусочно-полиномиальных концов определителя;
+    # бисекция остаётся для семейств без замкнутой формы и для пошаговых отчётов
+    if method == "analytic":
+        eps_critical = critical_eps(get_matrix, eps_curr)
+        if eps_critical is not None:
+            print(f"Критическое значение eps: {eps_critical}")
+            return eps_critical
+
+    # Для матриц n x n бисекция ведётся по проверке регулярности
+    if len(matrix) > 2:
+        eps_curr, eps_left_bound, amount = singularity_radius(get_matrix, 0, eps_curr, delta)
+        print(f"Кол-во вызовов функции: {amount}")
+        return eps_curr
     eps_left_bound = 0
     counter = 1
 
-    eps_curr, eps_left_bound, amount = optimize(eps_left_bound, eps_curr, delta, get_matrix=get_matrix, folder_name=folder_name)
+    eps_curr, eps_left_bound, amount = optimize(eps_left_bound, eps_curr, delta, get_matrix=get_matrix, folder_name=folder_name,
+                                                render=render)
 
     print(f"Кол-во вызовов функции: {counter + 1}")
     return eps_curr
 
 
 # Task info for research
-
-# determinant_optimization_new(delta=1e-10, get_matrix=get_interval_matrix, folder_name="fmatrix")
-determinant_optimization_new(delta=1e-10, get_matrix=get_interval_matrix_new, folder_name="smatrix")
\ No newline at end of file
+# Запуск только из командной строки: при импорте (в том числе процессами пула
+# отрисовки при spawn/forkserver) расчёт не выполняется
+
+if __name__ == "__main__":
+    # determinant_optimization_new(delta=1e-10, get_matrix=get_interval_matrix, folder_name="fmatrix",
+    #                              method="bisection", render=True)
+    determinant_optimization_new(delta=1e-10, get_matrix=get_interval_matrix_new, folder_name="smatrix",
+                                 method="bisection", render=True)
@@ -1,23 +1,32 @@
 import copy
 
+import intvalpy as ip
+
 from log_writer import LogWriter, LogWriterCode
 from drawer import Drawer, DrawCode
 import tools as t
 from codes import TestCode
+from result_cache import default_cache
 
 
 class MatrixTest:
-    def __init__(self, A, b, log_writer=LogWriter(), drawer=Drawer()):
+    # cache - ResultCache для решений; по умолчанию общий с LogWriter и Drawer.
+    # backend - метод максимизации Tol (по умолчанию точный LP для малых n)
+    def __init__(self, A, b, log_writer=LogWriter(), drawer=Drawer(), cache=default_cache, backend="auto"):
         self.A = copy.deepcopy(A)
         self.b = copy.deepcopy(b)
         self.log_writer = log_writer
         self.drawer = drawer
+        self.cache = cache
+        self.backend = backend
         self.test_exp = {TestCode.ACORRECTION: t.A_correction,
                          TestCode.ABCORRECTION: t.Ab_correction,
                          TestCode.BCORRECTION: t.b_correction}
         log_writer.log(name_test="Init_Matrix_Info", code=LogWriterCode.WRITEMATRIX, A=A, b=b)
-        log_writer.log(name_test=f"Init_info", code=LogWriterCode.WRITESOLV, info=t.solve(self.A, self.b))
-        _, max_x, max_Tol = t.emptinessTol(self.A, self.b)
+        # Одна максимизация Tol на систему: и журнал, и графики берут результат solve
+        info = t.solve(self.A, self.b, cache=cache, backend=backend)
+        log_writer.log(name_test=f"Init_info", code=LogWriterCode.WRITESOLV, info=info)
+        _, max_x, max_Tol = t.emptiness_from_solution(info)
         drawer.draw(name_test=f"Init_info", code=DrawCode.PLOTTOLSET, A=self.A, b=self.b,
                     max_x=max_x, max_Tol=max_Tol, title_name="Initial")
         self.drawer.draw(name_test="Init_info", code=DrawCode.PLOTTOLMESH,
@@ -25,11 +34,23 @@ class MatrixTest:
                          max_x=max_x, max_Tol=max_Tol,
                          title_name=f"Init")
 
-    def test(self, code: TestCode):
-        A_internal, b_internal = copy.deepcopy(self.A), copy.deepcopy(self.b)
+    # Коррекция исходной системы; концы результата хранятся в кэше
+    def corrected(self, code: TestCode):
+        def compute():
+            # Коррекции не меняют аргументы, поэтому копировать self.A и self.b не нужно
+            A, b = self.test_exp[code](self.A, self.b)
+            return ip.inf(A), ip.sup(A), ip.inf(b), ip.sup(b)
 
-        A_internal, b_internal = self.test_exp[code](A_internal, b_internal)
-        _, max_x, max_Tol = t.emptinessTol(A_internal, b_internal)
+        if self.cache is None:
+            infA, supA, infb, supb = compute()
+        else:
+            infA, supA, infb, supb = self.cache.get_or_compute("correction", (self.A, self.b), compute, code=str(code))
+        return ip.Interval(infA, supA), ip.Interval(infb, supb)
+
+    def test(self, code: TestCode):
+        A_internal, b_internal = self.corrected(code)
+        info = t.solve(A_internal, b_internal, cache=self.cache, backend=self.backend)
+        _, max_x, max_Tol = t.emptiness_from_solution(info)
 
         self.log_writer.log(name_test=f"Matrix_Info_with_{code}",
                             code=LogWriterCode.WRITEMATRIX,
@@ -45,5 +66,4 @@ class MatrixTest:
                          max_x=max_x, max_Tol=max_Tol,
                          title_name=f"After_{code}")
 
-        self.log_writer.log(name_test=f"After_{code}", code=LogWriterCode.WRITESOLV,
-                            info=t.solve(A_internal, b_internal))
+        self.log_writer.log(name_test=f"After_{code}", code=LogWriterCode.WRITESOLV, info=info)
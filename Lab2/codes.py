@@ -8,6 +8,7 @@ class StrEnum(str, Enum):
 class DrawCode(StrEnum):
     PLOTTOLSET = "tolerance_set"
     PLOTTOLMESH = "tolerance_mesh"
+    PLOTPARETO = "pareto_front"
 
 
 class LogWriterCode(StrEnum):
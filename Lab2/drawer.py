@@ -1,28 +1,156 @@
 from codes import DrawCode
-from tools import draw_Tol, draw_tol_set
+from tools import draw_Tol, draw_tol_set, draw_pareto_front
+from result_cache import ResultCache, default_cache
 
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+import intvalpy as ip
+import matplotlib
 import matplotlib.pyplot as plt
+import numpy as np
+
+# Файл с хэшем входных данных, по которым построены графики в папке
+STAMP_NAME = ".artifact_hash"
+
+
+def _init_worker():
+    matplotlib.use("Agg")
+
+
+def _is_option(value):
+    return value is None or isinstance(value, (str, bool))
+
+
+def _is_array(value):
+    return isinstance(value, (int, float, list, tuple, np.ndarray, np.number))
+
+
+class _Endpoints:
+    # Интервалы intvalpy не сериализуются pickle - в процесс отрисовки передаются концы
+    def __init__(self, value):
+        self.inf, self.sup = ip.inf(value), ip.sup(value)
+
+    def interval(self):
+        return ip.Interval(self.inf, self.sup)
+
+
+def artifact_key(code, kwargs):
+    """Хэш входных данных графика: интервалы и массивы - по содержимому,
+    строки и флаги (title_name и т.п.) - как параметры; cache не учитывается."""
+    data, options = [], {"code": str(code)}
+    for name in sorted(kwargs):
+        value = kwargs[name]
+        if name == "cache":
+            continue
+        if _is_option(value):
+            options[name] = value
+        elif _is_array(value):
+            data.append(np.asarray(value, dtype=float))
+        else:
+            data.append(value)
+    return ResultCache.key("artifact", *data, **options)
+
+
+def _stamp_file(path):
+    return os.path.join(path, STAMP_NAME)
+
+
+# Графики в папке актуальны, если хэш совпадает и все сохранённые файлы на месте
+def _is_current(path, key):
+    try:
+        with open(_stamp_file(path), encoding="utf-8") as file:
+            stamp = json.load(file)
+    except (OSError, ValueError):
+        return False
+    files = stamp.get("files") if isinstance(stamp, dict) else None
+    return stamp.get("key") == key and bool(files) and all(os.path.exists(os.path.join(path, name))
+                                                           for name in files)
+
+
+def _write_stamp(path, key, saved):
+    with open(_stamp_file(path), "w", encoding="utf-8") as file:
+        json.dump({"key": key, "files": [os.path.basename(name) for name in saved]}, file)
+
+
+def _remove_stamp(path):
+    try:
+        os.remove(_stamp_file(path))
+    except FileNotFoundError:
+        pass
+
+
+# Отрисовка; возвращает список сохранённых файлов
+def _render(func, path, kwargs):
+    kwargs = {name: value.interval() if isinstance(value, _Endpoints) else value
+              for name, value in kwargs.items()}
+    return func(path=path, **kwargs) or []
 
 
 class Drawer:
-    def __init__(self, name_folder_for_save="", need_show=False, need_save=False):
+    """Отрисовка графиков по DrawCode в graphics/<name_folder_for_save>/<code>/<name_test>.
+
+    skip_unchanged=True - график не перерисовывается, если в его папке уже
+    лежат файлы, сохранённые для тех же входных данных (A, b, max_x, max_Tol,
+    title_name...).
+    processes >= 1 - сохранение графиков выполняется в фоновом пуле процессов
+    на Agg, draw сразу возвращает управление; flush() дожидается всех отрисовок.
+    При need_show графики всегда строятся в текущем процессе.
+    """
+
+    def __init__(self, name_folder_for_save="", need_show=False, need_save=False, cache=default_cache,
+                 skip_unchanged=False, processes=None):
         self.need_show = need_show
         self.need_save = need_save
+        self.cache = cache
+        self.skip_unchanged = skip_unchanged
+        self.processes = processes
+        self.skipped = 0
+        self._pool = None
+        self._pending = []
         self.base_dir = os.path.abspath(os.path.join(".", f"graphics/{name_folder_for_save}"))
         self.drawer_map_tool = {
             DrawCode.PLOTTOLSET: draw_tol_set,
             DrawCode.PLOTTOLMESH: draw_Tol,
+            DrawCode.PLOTPARETO: draw_pareto_front,
         }
         os.makedirs(self.base_dir, exist_ok=True)
 
+    def _background(self):
+        return bool(self.processes) and self.need_save and not self.need_show
+
     def draw(self, name_test, code: DrawCode, **kwargs):
         try:
             path = os.path.join(self.base_dir, code, name_test)
             os.makedirs(path, exist_ok=True)
-            self.drawer_map_tool[code](path=path, need_save=self.need_save,
-                                       need_show=self.need_show,
-                                       **kwargs)
+            func = self.drawer_map_tool[code]
+
+            key = None
+            if self.skip_unchanged and self.need_save:
+                key = artifact_key(code, kwargs)
+                if not self.need_show and _is_current(path, key):
+                    self.skipped += 1
+                    return
+                # Хэш пишется заново только после успешной отрисовки
+                _remove_stamp(path)
+
+            kwargs = dict(kwargs, need_save=self.need_save, need_show=self.need_show)
+            if not self._background():
+                kwargs.setdefault("cache", self.cache)
+                saved = _render(func, path, kwargs)
+                if key is not None:
+                    _write_stamp(path, key, saved)
+                return
+
+            kwargs = {name: value if name == "cache" or _is_option(value) or _is_array(value) else _Endpoints(value)
+                      for name, value in kwargs.items()}
+            # В процесс отрисовки передаётся только дисковый уровень кэша
+            if "cache" not in kwargs and self.cache is not None and self.cache.path is not None:
+                kwargs["cache"] = ResultCache(path=self.cache.path)
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker)
+            self._pending.append((self._pool.submit(_render, func, path, kwargs), path, key))
 
         except KeyError as e:
             print(f"Ошибка: Некорректный код графика - {e}")
@@ -33,3 +161,25 @@ class Drawer:
         except Exception as e:
             print(f"Произошла непредвиденная ошибка: {e}")
             raise
+
+    def flush(self):
+        """Ожидание фоновых отрисовок и запись хэшей успешных; первая ошибка
+        пробрасывается после ожидания всех."""
+        pending, self._pending = self._pending, []
+        error = None
+        for future, path, key in pending:
+            try:
+                saved = future.result()
+                if key is not None:
+                    _write_stamp(path, key, saved)
+            except Exception as e:
+                print(f"Ошибка: Не удалось построить график - {e}")
+                error = error or e
+        if error is not None:
+            raise error
+
+    def close(self):
+        self.flush()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -1,14 +1,59 @@
+import json
 import os
+from collections import defaultdict
 
 import numpy as np
+import intvalpy as ip
 
 from codes import LogWriterCode
+from result_cache import default_cache
+from tools import solve
+
+LOG_NAME = "log.jsonl"
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _interval_record(value):
+    return {"inf": np.asarray(ip.inf(value), dtype=float), "sup": np.asarray(ip.sup(value), dtype=float)}
+
+
+def read_log(path):
+    """Записи журнала LogWriter из JSONL-файла (по одной записи на строку)."""
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def _format_interval(lower, upper):
+    return f"[{lower:.6g}, {upper:.6g}]"
 
 
 class LogWriter:
-    def __init__(self, name_folder_for_save="", need_show=False, need_save=False):
+    """Журнал результатов в Data/<name_folder_for_save>.
+
+    Каждый вызов log превращается в запись-словарь (концы интервалов, tol_max,
+    argmax, envs, таблица итераций). При need_save записи дописываются в
+    log.jsonl - основной машиночитаемый журнал, а LaTeX-файлы <code>/<name_test>.txt
+    и консольные таблицы строятся по записям. При buffered=True записи копятся
+    в памяти и выводятся одним проходом в flush(): log не делает ни форматирования,
+    ни файловых операций; latex=False отключает LaTeX, его можно построить позже
+    через write_latex(read_log(...)).
+    """
+
+    def __init__(self, name_folder_for_save="", need_show=False, need_save=False, cache=default_cache,
+                 buffered=False, latex=True):
         self.need_show = need_show
         self.need_save = need_save
+        self.cache = cache
+        self.buffered = buffered
+        self.latex = latex
+        self.records = []
         self.base_dir = os.path.abspath(os.path.join(".", f"Data/{name_folder_for_save}"))
         os.makedirs(self.base_dir, exist_ok=True)
 
@@ -20,75 +65,140 @@ class LogWriter:
             file.writelines(stmt)
         print(f"Файл {filename} сохранен")
 
-    def _matrix_and_vector_latexlog(self, A, b):
+    @staticmethod
+    def _matrix_and_vector_latexlog(record):
+        A_inf, A_sup = np.asarray(record["A"]["inf"]), np.asarray(record["A"]["sup"])
+        b_inf, b_sup = np.ravel(record["b"]["inf"]), np.ravel(record["b"]["sup"])
         lines = []
         # Начало LaTeX конструкции для матрицы
         lines.append("\\begin{equation}\n")
         lines.append("\t\\mathbf{A} = \\begin{pmatrix}\n")
-        # Преобразуем каждую строку матрицы в формат LaTeX и добавляем в список
-        for row in A:
-            row_str = " & ".join(f"[{item.a}, {item.b}]" for item in row) + " \\\\\n"
-            lines.append("\t\t" + row_str)
+        # Каждая строка матрицы в формате LaTeX
+        lines.extend("\t\t" + " & ".join(f"[{lower}, {upper}]" for lower, upper in zip(row_inf, row_sup)) + " \\\\\n"
+                     for row_inf, row_sup in zip(A_inf.tolist(), A_sup.tolist()))
         # Закрываем матрицу
         lines.append("\t\\end{pmatrix}")
-        # Преобразуем вектор b в LaTeX формат и добавляем его к уравнению
-        b_str = " \\\\ ".join(f"[{item.a}, {item.b}]" for item in b)
+        # Вектор b в LaTeX формате
+        b_str = " \\\\ ".join(f"[{lower}, {upper}]" for lower, upper in zip(b_inf.tolist(), b_sup.tolist()))
         lines.append("\\quad \n\t\\mathbf{b} = \\begin{pmatrix}\n" + "\t\t" + b_str + " \n\t\\end{pmatrix}")
         # Закрываем конструкцию уравнения
         lines.append("\n\\end{equation}\n")
         return lines
 
     @staticmethod
-    def _matrix_and_vector_consolelog(A, b):
-        # Обрабатываем каждый элемент как строку
-        print("A = \n" + "[" + "\n".join([" ".join(str(item) for item in row) for row in A]) + "]")
-        print(f"b = [{', '.join(str(item) for item in b)}]")
+    def _matrix_and_vector_consolelog(record):
+        A_inf, A_sup = np.asarray(record["A"]["inf"]), np.asarray(record["A"]["sup"])
+        b_inf, b_sup = np.ravel(record["b"]["inf"]), np.ravel(record["b"]["sup"])
+        rows = (" ".join(_format_interval(lower, upper) for lower, upper in zip(row_inf, row_sup))
+                for row_inf, row_sup in zip(A_inf.tolist(), A_sup.tolist()))
+        print("A = \n" + "[" + "\n".join(rows) + "]")
+        print(f"b = [{', '.join(_format_interval(lower, upper) for lower, upper in zip(b_inf.tolist(), b_sup.tolist()))}]")
+
+    @staticmethod
+    def _iterations(record, skip=()):
+        # Таблица итераций: столбцы - ключи первой записи (у tolsolvty и LP они разные)
+        iterations = record["iterations"]
+        columns = [key for key in iterations[0] if key not in ("Iter", *skip)] if iterations else []
+        return iterations, columns
 
-    def _prepare_for_latex_save_solve_info(self, tol_max, argmax, envs, stmt):
+    @staticmethod
+    def _cell(value):
+        return f"{value:.3f}" if isinstance(value, float) else f"{value}"
+
+    def _prepare_for_latex_save_solve_info(self, record):
         """Генерация LaTeX форматированного текста для результатов расчета."""
         lines = ["\\begin{equation}\n"]
-        lines.append(f"\tTol_{{max}} = {tol_max:.3g}\n")
+        lines.append(f"\tTol_{{max}} = {record['tol_max']:.3g}\n")
         lines.append("\\end{equation}\n")
 
         # Добавляем аргмакс в виде вектора
         lines.append("\\begin{equation}\n")
-        argmax_str = " \\\\\n\t\t\t".join(f"{np.round(item, 3)[0]}" for item in argmax)
+        argmax_str = " \\\\\n\t\t\t".join(f"{item}" for item in np.round(np.ravel(record["argmax"]), 3).tolist())
         lines.append("\t\\text Arg_{max} =\n\t\t" + "\\begin{pmatrix}\n\t\t\t" + argmax_str + "\n\t\t\\end{pmatrix}")
         lines.append("\n\\end{equation}\n")
         # Добавляем envs как таблицу
         lines.append("\\begin{equation}\n")
-        envs_str = "\n\t\t\t".join(" & ".join(f"{np.round(item, 3)}" for item in row) + " \\\\" for row in envs)
+        envs = np.round(np.atleast_2d(record["envs"]), 3).tolist()
+        envs_str = "\n\t\t\t".join(" & ".join(f"{item}" for item in row) + " \\\\" for row in envs)
         lines.append("\t\\text Envs =\n\t\t" + "\\begin{pmatrix}\n\t\t\t" + envs_str + "\n\t\t\\end{pmatrix}")
         lines.append("\n\\end{equation}\n")
-        # Парсинг stmt для добавления информации по итерациям в формате LaTeX
+        # Информация по итерациям в формате LaTeX
+        iterations, columns = self._iterations(record, skip=("StepIdx",))
         lines.append("\\begin{equation}\n")
-        lines.append("\t\\begin{array}{cccc}\n")
-        lines.append("\t\tIter & Tol(x) & Tol(xx) & TotalSteps \\\\\\hline\n")
-        for iter_num, data in stmt.items():
-            lines.append(f"\t\t\t{iter_num} & {data['Tol(x)']:.3f} & {data['Tol(xx)']:.3f} & {data['TotalSteps']} \\\\\n")
+        lines.append("\t\\begin{array}{" + "c" * (len(columns) + 1) + "}\n")
+        lines.append("\t\t" + " & ".join(["Iter"] + columns) + " \\\\\\hline\n")
+        lines.extend("\t\t\t" + " & ".join([f"{row['Iter']}"] + [self._cell(row[key]) for key in columns]) + " \\\\\n"
+                     for row in iterations)
         lines.append("\t\\end{array}\n")
         lines.append("\\end{equation}\n")
 
         return lines
 
     # Метод для логгирования в консоль результатов расчета
-    def _solve_info_intolog(self, tol_max, argmax, envs, stmt):
+    def _solve_info_intolog(self, record):
         res = []
-        res.append(f"Tol_max = {tol_max}\n")
-        res.append("Arg_max = [" + ", ".join(f"{np.round(item, 3)}" for item in argmax) + "]\n")
+        res.append(f"Tol_max = {record['tol_max']}\n")
+        res.append("Arg_max = [" + ", ".join(f"{item}" for item in np.round(np.ravel(record["argmax"]), 3).tolist()) + "]\n")
 
         # Добавление envs как строкового вывода таблицы
         res.append("Envs:\n")
-        res.extend(" | ".join(f"{np.round(item, 3)}" for item in row) + "\n" for row in envs)
+        res.extend(" | ".join(f"{item}" for item in row) + "\n"
+                   for row in np.round(np.atleast_2d(record["envs"]), 3).tolist())
 
-        # Парсинг stmt для консольного вывода информации по итерациям
+        # Информация по итерациям
+        iterations, columns = self._iterations(record)
         res.append("Iteration Info:\n")
-        for iter_num, data in stmt.items():
-            res.append(f"Iter {iter_num}: Tol(x)={data['Tol(x)']:.3f}, Tol(xx)={data['Tol(xx)']:.3f}, "
-                       f"StepIdx={data['StepIdx']}, TotalSteps={data['TotalSteps']}\n")
+        res.extend(f"Iter {row['Iter']}: " + ", ".join(f"{key}={self._cell(row[key])}" for key in columns) + "\n"
+                   for row in iterations)
 
         return res
 
+    def _matrix_record(self, name_test, A, b):
+        return {"test": name_test, "code": LogWriterCode.WRITEMATRIX.value,
+                "A": _interval_record(A), "b": _interval_record(b)}
+
+    def _solve_record(self, name_test, tol_max, argmax, envs, stmt):
+        return {"test": name_test, "code": LogWriterCode.WRITESOLV.value, "tol_max": float(tol_max),
+                "argmax": np.asarray(argmax, dtype=float), "envs": np.asarray(envs, dtype=float),
+                "iterations": [{"Iter": iter_num, **data} for iter_num, data in stmt.items()]}
+
+    def write_latex(self, records):
+        """LaTeX-файлы по записям: все записи одного файла пишутся за одно открытие."""
+        files = defaultdict(list)
+        for record in records:
+            if record["code"] == LogWriterCode.WRITEMATRIX:
+                files[record["code"], record["test"]].extend(self._matrix_and_vector_latexlog(record))
+            elif record["code"] == LogWriterCode.WRITESOLV:
+                files[record["code"], record["test"]].extend(self._prepare_for_latex_save_solve_info(record))
+        for (code, name_test), lines in files.items():
+            self._save(stmt=lines, filename=name_test, code=code)
+
+    def _write(self, records):
+        for record in records:
+            if record["code"] == LogWriterCode.WRITEMATRIX:
+                LogWriter._matrix_and_vector_consolelog(record)
+            elif self.need_show:
+                print("Результаты решения:")
+                for line in self._solve_info_intolog(record):
+                    print(line)
+        if self.need_save:
+            with open(os.path.join(self.base_dir, LOG_NAME), "a", encoding="utf-8") as file:
+                file.writelines(json.dumps(record, default=_json_default) + "\n" for record in records)
+            if self.latex:
+                self.write_latex(records)
+
+    def flush(self):
+        """Вывод накопленных записей (консоль, log.jsonl, LaTeX)."""
+        records, self.records = self.records, []
+        self._write(records)
+        return records
+
+    def _emit(self, record):
+        if self.buffered:
+            self.records.append(record)
+        else:
+            self._write([record])
+
     def log(self, name_test, code: LogWriterCode, **kwargs):
         try:
             if code == LogWriterCode.WRITEMATRIX:
@@ -98,30 +208,16 @@ class LogWriter:
                 if A is None or b is None:
                     raise ValueError("Отсутствуют обязательные аргументы 'A' и/или 'b' для WRITEMATRIX.")
 
-                LogWriter._matrix_and_vector_consolelog(A, b)
-                if self.need_save:
-                    self._save(
-                        stmt=self._matrix_and_vector_latexlog(A, b),
-                        filename=f"{name_test}",
-                        code=code
-                    )
+                self._emit(self._matrix_record(name_test, A, b))
             elif code == LogWriterCode.WRITESOLV:
-                # Извлекаем данные из аргумента "info" и передаем их в функции
+                # Извлекаем данные из аргумента "info" либо решаем систему A, b через кэш
                 info = kwargs.get("info")
+                if info is None and kwargs.get("A") is not None and kwargs.get("b") is not None:
+                    info = solve(kwargs["A"], kwargs["b"], cache=self.cache)
                 if not info or len(info) < 4:
                     raise ValueError("Отсутствует необходимая информация для WRITESOLV.")
 
-                tol_max, argmax, envs, stmt = info
-                if self.need_show:
-                    print("Результаты решения:")
-                    for line in self._solve_info_intolog(tol_max, argmax, envs, stmt):
-                        print(line)
-                if self.need_save:
-                    self._save(
-                        stmt=self._prepare_for_latex_save_solve_info(tol_max, argmax, envs, stmt),
-                        filename=f"{name_test}",
-                        code=code
-                    )
+                self._emit(self._solve_record(name_test, *info[:4]))
             else:
                 print("Неизвестный код операции.")
 
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from collections import OrderedDict
+
+import numpy as np
+import intvalpy as ip
+
+
+# Версия формата записей; менять при изменении _pack/_unpack или смысла результатов
+FORMAT_VERSION = 1
+
+
+# Модули, чьи результаты попадают в кэш: solver.py (tolsolvty, LP), tools.py
+# ("solve", "correction", "tol_set", "tol_grid") и сам формат записей
+CACHED_MODULES = ("solver.py", "tools.py", "MatrixTest.py", "result_cache.py")
+
+
+def _source_version(names):
+    # Записи, посчитанные другой версией этих модулей, не используются
+    digest = hashlib.sha1()
+    for name in names:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), name), "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+VERSION = f"{FORMAT_VERSION}:{_source_version(CACHED_MODULES)}"
+
+
+def _endpoints(value):
+    if isinstance(value, np.ndarray):
+        return [value]
+    return [np.asarray(ip.inf(value), dtype=float), np.asarray(ip.sup(value), dtype=float)]
+
+
+# Сериализация результата в массивы .npz: массивы и числа хранятся как есть,
+# словари (stmt) - строкой JSON
+def _pack(result):
+    arrays = {}
+    for i, item in enumerate(result):
+        if isinstance(item, dict):
+            arrays[f"json_{i}"] = np.array(json.dumps(item))
+        else:
+            arrays[f"item_{i}"] = np.asarray(item)
+    return arrays
+
+
+def _unpack_json(text):
+    data = json.loads(text)
+    return {int(key) if key.isdigit() else key: value for key, value in data.items()}
+
+
+def _unpack(archive):
+    items = {}
+    for name in archive.files:
+        kind, index = name.rsplit("_", 1)
+        value = archive[name]
+        if kind == "json":
+            items[int(index)] = _unpack_json(str(value))
+        else:
+            items[int(index)] = value.item() if value.ndim == 0 else value
+    return tuple(items[i] for i in range(len(items)))
+
+
+class ResultCache:
+    """Кэш результатов расчётов по содержимому интервальных данных.
+
+    Ключ - SHA-1 от VERSION (формат и содержимое CACHED_MODULES), концов
+    интервалов (A, b, ...) и параметров расчёта.
+    Результаты (кортежи массивов, чисел и словарей) хранятся в памяти в
+    LRU-списке на maxsize записей, а при заданном path ещё и в файлах
+    <path>/<ключ>.npz, так что повторный запуск на тех же данных не
+    пересчитывает ничего. Возвращаемые массивы общие - их нельзя менять.
+    """
+
+    def __init__(self, maxsize=128, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def key(kind, *data, **options):
+        digest = hashlib.sha1(f"{VERSION}:{kind}".encode())
+        for value in data:
+            for array in _endpoints(value):
+                array = np.ascontiguousarray(array)
+                digest.update(f"{array.dtype.str}{array.shape}".encode())
+                digest.update(array.tobytes())
+        digest.update(repr(sorted(options.items())).encode())
+        return digest.hexdigest()
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{key}.npz")
+
+    def _remember(self, key, result):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+        if self.path is not None and os.path.exists(self._file(key)):
+            # Повреждённая запись (например, от прерванной старой записи) - промах
+            try:
+                with np.load(self._file(key)) as archive:
+                    result = _unpack(archive)
+            except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+                return None
+            self._remember(key, result)
+            return result
+        return None
+
+    def put(self, key, result):
+        result = tuple(result)
+        self._remember(key, result)
+        if self.path is not None:
+            # Запись во временный файл и атомарная замена: параллельные процессы
+            # и прерванная запись не оставляют обрезанных файлов
+            fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    np.savez(file, **_pack(result))
+                os.replace(tmp, self._file(key))
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        return result
+
+    def get_or_compute(self, kind, data, compute, **options):
+        """Результат compute() для данных data (кортеж интервалов и массивов)
+        и параметров options; compute вызывается только при промахе."""
+        key = self.key(kind, *data, **options)
+        result = self.get(key)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        return self.put(key, compute())
+
+    def clear(self):
+        self._memory.clear()
+
+
+# Кэш по умолчанию, общий для MatrixTest, Drawer и функций tools
+default_cache = ResultCache()
@@ -0,0 +1,93 @@
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import intvalpy as ip
+import matplotlib
+
+from result_cache import ResultCache
+
+
+def _init_worker():
+    matplotlib.use("Agg")
+
+
+def run_scenario(name, bounds, codes, need_save=True, cache_path=None, render_processes=None):
+    """Один сценарий: MatrixTest для системы с концами bounds = (infA, supA,
+    infb, supb) и тесты codes. Drawer и LogWriter у сценария свои и ничего не
+    показывают, журнал буферизуется до конца сценария, неизменившиеся
+    графики не перерисовываются, консольный вывод перехватывается и
+    возвращается вместе с временами этапов: (name, timings, output)."""
+    from MatrixTest import MatrixTest
+    from drawer import Drawer
+    from log_writer import LogWriter
+
+    infA, supA, infb, supb = bounds
+    cache = ResultCache(path=cache_path)
+    timings = {}
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        start = time.perf_counter()
+        drawer = Drawer(need_show=False, need_save=need_save, name_folder_for_save=name, cache=cache,
+                        skip_unchanged=True, processes=render_processes)
+        log_writer = LogWriter(need_show=False, need_save=need_save, name_folder_for_save=name, cache=cache,
+                               buffered=True)
+        test = MatrixTest(ip.Interval(infA, supA), ip.Interval(infb, supb), log_writer, drawer, cache=cache)
+        timings["init"] = time.perf_counter() - start
+        for code in codes:
+            start = time.perf_counter()
+            test.test(code=code)
+            timings[str(code)] = time.perf_counter() - start
+        start = time.perf_counter()
+        log_writer.flush()
+        timings["log"] = time.perf_counter() - start
+        start = time.perf_counter()
+        drawer.close()
+        timings["render"] = time.perf_counter() - start
+    return name, timings, output.getvalue()
+
+
+def run_scenarios(scenarios, processes=None, need_save=True, cache_path=None, render_processes=None, verbose=True):
+    """Запуск сценариев (name, A, b, codes) в пуле процессов.
+
+    processes=None - по числу ядер, processes=1 - последовательно в текущем
+    процессе; render_processes - фоновый пул отрисовки в каждом сценарии
+    (см. Drawer), "render" в сводке - ожидание незавершённых отрисовок.
+    Результаты (name, timings, output) возвращаются в порядке scenarios
+    независимо от того, какой сценарий закончился раньше; при verbose
+    печатается перехваченный вывод сценариев и сводка времён.
+    """
+    jobs = [(name, (ip.inf(A), ip.sup(A), ip.inf(b), ip.sup(b)), list(codes), need_save, cache_path,
+             render_processes)
+            for name, A, b, codes in scenarios]
+    processes = os.cpu_count() if processes is None else processes
+
+    start = time.perf_counter()
+    if processes <= 1:
+        results = [run_scenario(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(processes, len(jobs)), initializer=_init_worker) as pool:
+            results = list(pool.map(run_scenario, *zip(*jobs)))
+    wall = time.perf_counter() - start
+
+    if verbose:
+        for _, _, output in results:
+            print(output, end="")
+        print(timing_summary(results, wall))
+    return results
+
+
+def timing_summary(results, wall=None):
+    lines = [f"{'scenario':<16}{'stage':<24}{'time, s':>10}"]
+    total = 0.
+    for name, timings, _ in results:
+        for stage, seconds in timings.items():
+            lines.append(f"{name:<16}{stage:<24}{seconds:>10.3f}")
+        lines.append(f"{name:<16}{'total':<24}{sum(timings.values()):>10.3f}")
+        total += sum(timings.values())
+    lines.append(f"{'all':<16}{'sum':<24}{total:>10.3f}")
+    if wall is not None:
+        lines.append(f"{'all':<16}{'wall':<24}{wall:>10.3f}")
+    return "\n".join(lines)
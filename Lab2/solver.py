@@ -2,11 +2,60 @@ import numpy as np
 from numpy.linalg import svd, lstsq, norm
 from numpy import (size, all, newaxis, ones, ceil, any, abs, maximum, min, argmin, max, zeros, eye, finfo, mod, roll,
                    sum, c_, arange, sort, argsort)
+from scipy.optimize import linprog
 
-# Функция для определения разрешимости задачи с интервальной линейной системой
-def tolsolvty(infA, supA, infb, supb, *varargin):
+def _kernel_calcfg(infA, supA, Ac, Ar, bc, br, weight):
+    """calcfg без временных массивов: все промежуточные величины пишутся через
+    out= в буферы, выделенные один раз. Суперградиент записывается в g_out,
+    вектор образующих tt - общий буфер, перезаписываемый каждым вызовом."""
+    m, n = Ac.shape
+    infA, supA = np.ascontiguousarray(infA), np.ascontiguousarray(supA)
+    absx, neg = np.empty((n, 1)), np.empty((n, 1), dtype=bool)
+    Ac_x, Ar_absx = np.empty((m, 1)), np.empty((m, 1))
+    infs, sups, tmp, tt = np.empty((m, 1)), np.empty((m, 1)), np.empty((m, 1)), np.empty((m, 1))
+    tt_flat = tt.ravel()
+
+    def calcfg(x, g_out):
+        np.abs(x, out=absx)
+        np.matmul(Ac, x, out=Ac_x)
+        np.matmul(Ar, absx, out=Ar_absx)
+        np.add(Ac_x, Ar_absx, out=infs)
+        np.subtract(bc, infs, out=infs)
+        np.subtract(Ac_x, Ar_absx, out=sups)
+        np.subtract(bc, sups, out=sups)
+        np.abs(infs, out=tmp)
+        np.abs(sups, out=tt)
+        np.maximum(tmp, tt, out=tt)
+        np.subtract(br, tt, out=tt)
+        np.multiply(weight, tt, out=tt)
+        mc = tt_flat.argmin()
+
+        # Строка mc матриц концов - представление без копирования
+        np.less(x, 0, out=neg)
+        if -infs[mc, 0] > sups[mc, 0]:
+            np.copyto(g_out, supA[mc, :, newaxis])
+            np.copyto(g_out, infA[mc, :, newaxis], where=neg)
+            g_out *= -weight[mc, 0]
+        else:
+            np.copyto(g_out, infA[mc, :, newaxis])
+            np.copyto(g_out, supA[mc, :, newaxis], where=neg)
+            g_out *= weight[mc, 0]
+        return tt[mc, 0], g_out, tt
+
+    return calcfg
+
+
+# Функция для определения разрешимости задачи с интервальной линейной системой.
+# x0, B0, hs0 - начальная точка, матрица растяжения пространства и шаг (например,
+# из state предыдущего решения близкой задачи); при return_state=True
+# дополнительно возвращается state для продолжения счёта.
+# kernel=True включает calcfg на заранее выделенных буферах; log управляет
+# протоколом итераций stmt (по умолчанию ведётся только вне режима kernel)
+def tolsolvty(infA, supA, infb, supb, *varargin, x0=None, B0=None, hs0=None, return_state=False,
+              kernel=False, log=None):
     # Переменная для хранения логов по каждой итерации в виде словаря
     stmt = {}
+    log = not kernel if log is None else log
 
     # Определение размеров матриц
     mi, ni = size(infA, 0), size(infA, 1)
@@ -35,7 +84,7 @@ def tolsolvty(infA, supA, infb, supb, *varargin):
     epsx = 1.e-6
     epsg = 1.e-6
     alpha = 2.3
-    hs = 1.0
+    hs = 1.0 if hs0 is None else hs0
     nh = 3
     q1, q2 = 0.9, 1.1
     iprn = 1
@@ -60,7 +109,7 @@ def tolsolvty(infA, supA, infb, supb, *varargin):
                         if nargin >= 10:
                             maxitn = varargin[5]
 
-    def calcfg(x):
+    def calcfg(x, g_out=None):
         """Вычисляет значение функционала и градиента в точке x."""
         absx = abs(x)
         Ac_x = Ac @ x
@@ -83,18 +132,28 @@ def tolsolvty(infA, supA, infb, supb, *varargin):
     Ar = 0.5 * (supA - infA)
     bc = 0.5 * (infb + supb)
     br = 0.5 * (supb - infb)
+    # В режиме kernel суперградиенты пишутся попеременно в два буфера,
+    # чтобы g0 не перезаписывался при вычислении g1
+    g_buffers = (None, None)
+    if kernel:
+        calcfg = _kernel_calcfg(infA, supA, Ac, Ar, bc, br, weight)
+        g_buffers = (np.empty((n, 1)), np.empty((n, 1)))
 
     # Разложение и проверка на согласованность
     sv = svd(Ac, compute_uv=False)[:, newaxis]
     x = lstsq(Ac, bc, rcond=None)[0] if (min(sv) != 0 and max(sv) / min(sv) < 1.e+12) else zeros((n, 1))
+    if x0 is not None:
+        x = np.array(x0, dtype=float).reshape(n, 1)
 
-    B = eye(n, n)  # Матрица преобразования
+    B = eye(n, n) if B0 is None else np.array(B0, dtype=float)  # Матрица преобразования
     vf = finfo(float).max * ones((nsims, 1))  # Отслеживание значений функции
-    [f, g0, tt] = calcfg(x)
-    ff, xx = f, x  # Инициализация значений оптимизации
+    [f, g0, tt] = calcfg(x, g_buffers[0])
+    # x меняется на месте (x += hs * g), поэтому лучшая точка хранится копией
+    ff, xx = f, x.copy()  # Инициализация значений оптимизации
     cal, ncals = 1, 1
 
-    stmt[0] = {'Tol(x)': f, 'Tol(xx)': ff, 'StepIdx': cal, 'TotalSteps': ncals}
+    if log:
+        stmt[0] = {'Tol(x)': f, 'Tol(xx)': ff, 'StepIdx': cal, 'TotalSteps': ncals}
 
     for itn in range(1, maxitn + 1):
         # Адаптация шага и проверка на сходимость
@@ -105,15 +164,16 @@ def tolsolvty(infA, supA, infb, supb, *varargin):
         g1 = B.conj().T @ g0
         g = B @ g1 / norm(g1)
         normg = norm(g)
+        g_out = g_buffers[1] if g0 is g_buffers[0] else g_buffers[0]
 
         r, cal, deltax, ccode = 1, 0, 0, 0
         while r > 0 and cal <= 500:
             cal += 1
             x += hs * g
             deltax += hs * normg
-            f, g1, tt = calcfg(x)
+            f, g1, tt = calcfg(x, g_out)
             if f > ff:
-                ff, xx = f, x
+                ff, xx = f, x.copy()
 
             if mod(cal, nh) == 0:
                 hs *= q2
@@ -126,7 +186,7 @@ def tolsolvty(infA, supA, infb, supb, *varargin):
         if cal == 1:
             hs *= q1
         ncals += cal
-        if itn == iprn:
+        if log and itn == iprn:
             stmt[itn] = {'Tol(x)': f, 'Tol(xx)': ff, 'StepIdx': cal, 'TotalSteps': ncals}
             iprn += iprn
         if deltax < epsx:
@@ -151,7 +211,283 @@ def tolsolvty(infA, supA, infb, supb, *varargin):
     z, ind = sort(tt[:, [1]], 0), argsort(tt[:, [1]], 0)
     envs = tt[ind[:, 0], :]
 
-    if iprn > 0 and mod(itn, iprn) != 0:
+    if log and iprn > 0 and mod(itn, iprn) != 0:
         stmt[itn] = {'Tol(x)': f, 'Tol(xx)': ff, 'StepIdx': cal, 'TotalSteps': ncals}
 
+    if return_state:
+        state = {'x': argmax.copy(), 'B': B, 'hs': hs, 'itn': itn, 'ncals': ncals}
+        return tolmax, argmax, envs, ccode, stmt, state
     return tolmax, argmax, envs, ccode, stmt
+
+
+class TolSession:
+    """Последовательное решение близких задач максимизации Tol.
+
+    Каждый вызов solve начинает r-алгоритм из состояния, на котором
+    остановилось предыдущее решение: точки максимума и шага, при reuse_B=True
+    ещё и матрицы растяжения пространства. Сжатая к концу счёта матрица
+    заставляет одномерный поиск долго разгоняться, если максимум сдвинулся,
+    поэтому по умолчанию она не переносится. Первый вызов и вызов после reset
+    стартуют как обычный tolsolvty. В history копятся число итераций и
+    вычислений функционала по каждому решению.
+    """
+
+    def __init__(self, *varargin, reuse_B=False):
+        self.varargin = varargin
+        self.reuse_B = reuse_B
+        self.state = None
+        self.history = []
+
+    def reset(self):
+        self.state = None
+
+    def solve(self, infA, supA, infb, supb):
+        warm = {}
+        if self.state is not None and size(self.state['x'], 0) == size(infA, 1):
+            warm = {'x0': self.state['x'], 'hs0': self.state['hs']}
+            if self.reuse_B:
+                warm['B0'] = self.state['B']
+        *result, self.state = tolsolvty(infA, supA, infb, supb, *self.varargin, return_state=True, **warm)
+        self.history.append({'itn': self.state['itn'], 'ncals': self.state['ncals']})
+        return tuple(result)
+
+
+def tolsolvty_batch(infA, supA, infb, supb, weight=None, epsf=1.e-6, epsx=1.e-6, epsg=1.e-6, maxitn=2000):
+    """Максимизация Tol для пакета систем одинакового размера.
+
+    infA, supA имеют форму (B, m, n), infb, supb - (B, m) или (B, m, 1).
+    r-алгоритм Шора идёт по всем системам одновременно: шаг hs, матрица
+    растяжения пространства и код остановки у каждой системы свои, сошедшиеся
+    системы исключаются из дальнейших итераций. В отличие от tolsolvty
+    argmax - точка, где достигнут tolmax. Возвращает массивы
+    (tolmax (B,), argmax (B, n, 1), envs (B, m, 2), ccode (B,)).
+    """
+    infA, supA = np.asarray(infA, dtype=float), np.asarray(supA, dtype=float)
+    infb = np.asarray(infb, dtype=float).reshape(infA.shape[0], -1, 1)
+    supb = np.asarray(supb, dtype=float).reshape(infA.shape[0], -1, 1)
+    if infA.shape != supA.shape or infA.ndim != 3:
+        raise ValueError("Ошибка: infA и supA должны иметь одинаковую форму (B, m, n).")
+    bs, m, n = infA.shape
+    if infb.shape != supb.shape or infb.shape[1] != m:
+        raise ValueError("Ошибка: размер матриц не совпадает с размером векторов.")
+    if not all(infA <= supA):
+        raise ValueError("Ошибка: неверные интервальные элементы в матрице (infA должен быть <= supA).")
+    if not all(infb <= supb):
+        raise ValueError("Ошибка: неверные интервальные элементы в векторе (infb должен быть <= supb).")
+    weight = ones((bs, m, 1)) if weight is None else np.broadcast_to(np.asarray(weight, dtype=float).reshape(-1, m, 1), (bs, m, 1))
+    if any(weight <= 0):
+        raise ValueError("Ошибка: веса должны быть положительными.")
+
+    nsims, alpha, nh, q1, q2 = 30, 2.3, 3, 0.9, 1.1
+
+    Ac = 0.5 * (infA + supA)
+    Ar = 0.5 * (supA - infA)
+    bc = 0.5 * (infb + supb)
+    br = 0.5 * (supb - infb)
+
+    def calcfg(x, idx):
+        """Значения функционала, суперградиенты и образующие для систем idx."""
+        Ac_x = Ac[idx] @ x
+        Ar_absx = Ar[idx] @ abs(x)
+        infs = bc[idx] - (Ac_x + Ar_absx)
+        sups = bc[idx] - (Ac_x - Ar_absx)
+        tt = weight[idx] * (br[idx] - maximum(abs(infs), abs(sups)))
+        mc = argmin(tt[:, :, 0], axis=1)
+        rows = arange(len(idx))
+        f = tt[rows, mc, 0]
+
+        infA_mc = infA[idx, mc][:, :, newaxis]
+        supA_mc = supA[idx, mc][:, :, newaxis]
+        dl = infA_mc * (x < 0) + supA_mc * (x >= 0)
+        ds = supA_mc * (x < 0) + infA_mc * (x >= 0)
+        w = weight[idx, mc]
+        lower_active = (-infs[rows, mc] > sups[rows, mc])[:, newaxis]
+        g = np.where(lower_active, -w[:, newaxis] * dl, w[:, newaxis] * ds)
+        return f, g, tt
+
+    # Начальное приближение - псевдорешение для хорошо обусловленных систем
+    sv = svd(Ac, compute_uv=False)
+    good = (sv.min(axis=1) != 0) & (sv.max(axis=1) < 1.e+12 * sv.min(axis=1))
+    x = np.where(good[:, newaxis, newaxis], np.linalg.pinv(Ac) @ bc, 0.0)
+
+    all_idx = arange(bs)
+    B = np.tile(eye(n), (bs, 1, 1))
+    vf = finfo(float).max * ones((bs, nsims))
+    hs = ones(bs)
+    ccode = zeros(bs, dtype=int)
+    f, g0, tt = calcfg(x, all_idx)
+    ff, xx = f.copy(), x.copy()
+
+    active = all_idx
+    for itn in range(1, maxitn + 1):
+        if len(active) == 0:
+            break
+        vf[active, nsims - 1] = ff[active]
+
+        stop = norm(g0[active], axis=(1, 2)) < epsg
+        ccode[active[stop]] = 2
+        active = active[~stop]
+        if len(active) == 0:
+            break
+
+        Ba = B[active]
+        g1 = Ba.transpose(0, 2, 1) @ g0[active]
+        g = Ba @ g1 / norm(g1, axis=(1, 2))[:, newaxis, newaxis]
+        normg = norm(g, axis=(1, 2))
+
+        # Одномерный поиск: каждая система делает столько шагов, сколько нужно ей
+        cal = zeros(len(active), dtype=int)
+        deltax = zeros(len(active))
+        searching = np.ones(len(active), dtype=bool)
+        while any(searching):
+            s = np.flatnonzero(searching)
+            idx = active[s]
+            cal[s] += 1
+            x[idx] += hs[idx, newaxis, newaxis] * g[s]
+            deltax[s] += hs[idx] * normg[s]
+            f_s, g1_s, tt_s = calcfg(x[idx], idx)
+            g1[s], tt[idx] = g1_s, tt_s
+            better = f_s > ff[idx]
+            ff[idx[better]] = f_s[better]
+            xx[idx[better]] = x[idx[better]]
+            hs[idx[cal[s] % nh == 0]] *= q2
+            r = (g[s].transpose(0, 2, 1) @ g1_s)[:, 0, 0]
+            searching[s] = (r > 0) & (cal[s] <= 500)
+
+        stop = cal > 500
+        ccode[active[stop]] = 5
+        hs[active[cal == 1]] *= q1
+        stop |= deltax < epsx
+        ccode[active[(deltax < epsx) & (cal <= 500)]] = 3
+
+        keep = ~stop
+        active, g1, Ba = active[keep], g1[keep], Ba[keep]
+        dg = Ba.transpose(0, 2, 1) @ (g1 - g0[active])
+        xi = dg / norm(dg, axis=(1, 2))[:, newaxis, newaxis]
+        B[active] = Ba + (1. / alpha - 1.) * (Ba @ xi) @ xi.transpose(0, 2, 1)
+        g0[active] = g1
+
+        vf[active] = roll(vf[active], 1, axis=1)
+        vf[active, 0] = abs(ff[active] - vf[active, 0])
+        abs_ff = abs(ff[active])
+        deltaf = sum(vf[active], axis=1) / np.where(abs_ff > 1, abs_ff, 1.0)
+        stop = deltaf < epsf
+        ccode[active[stop]] = 1
+        ccode[active[~stop]] = 4
+        active = active[~stop]
+
+    # Образующие, отсортированные по значению, как envs у tolsolvty
+    order = argsort(tt[:, :, 0], axis=1)
+    envs = np.stack([order + 1, np.take_along_axis(tt[:, :, 0], order, axis=1)], axis=2)
+    return ff, xx, envs, ccode
+
+
+def _tol_lp(Ac, Ar, bc, br, weight):
+    """LP максимума Tol по строкам Ac, Ar, bc, br: возвращает (t, x, статус)."""
+    m, n = Ac.shape
+    ones_m, eye_n = ones((m, 1)), eye(n)
+    A_ub = np.block([
+        [-weight * Ac, weight * Ar, ones_m],
+        [weight * Ac, weight * Ar, ones_m],
+        [eye_n, -eye_n, zeros((n, 1))],
+        [-eye_n, -eye_n, zeros((n, 1))],
+    ])
+    b_ub = np.concatenate([(weight * (br - bc)).ravel(), (weight * (br + bc)).ravel(), zeros(2 * n)])
+    cost = zeros(2 * n + 1)
+    cost[-1] = -1.
+    bounds = [(None, None)] * n + [(0, None)] * n + [(None, None)]
+    res = linprog(cost, A_ub=A_ub, b_ub=b_ub, bounds=bounds, method="highs")
+    if res.status != 0:
+        raise ValueError(f"Ошибка: linprog не нашёл максимум Tol ({res.message}).")
+    return -res.fun, res.x[:n, newaxis], res.status
+
+
+def tolsolvty_lp(infA, supA, infb, supb, weight=None, rtol=1.e-9, x0=None, max_rounds=50):
+    """Точный максимум Tol через линейное программирование (HiGHS).
+
+    Модуль |x| заменяется вспомогательными переменными u >= |x|, а модуль
+    |bc - Ac x| - парой ограничений на каждую строку:
+        max t  при  t <= w_i (br_i -+ (bc_i - Ac_i x) - Ar_i u),  -u <= x <= u.
+    Так как Ar >= 0, в оптимуме u = |x| и значение совпадает с max Tol.
+    При m >> n почти все строки неактивны, поэтому LP решается по растущему
+    набору строк: максимум по подмножеству ограничивает max Tol сверху, и как
+    только Tol в найденной точке отличается от него не больше чем на rtol,
+    точка оптимальна; иначе в набор добавляются нарушенные строки. Начальный
+    набор - худшие строки в точке x0 (например, argmax близкой задачи), по
+    умолчанию - в псевдорешении. Если все нарушенные строки уже в наборе
+    (погрешность HiGHS больше rtol на плохо масштабированных строках),
+    принимается текущая точка; после max_rounds раундов решается LP по всем строкам.
+    Возвращает то же, что tolsolvty: (tolmax, argmax, envs, ccode, stmt),
+    ccode - статус linprog (0 - решение найдено), stmt - размеры наборов строк.
+    """
+    infA, supA = np.asarray(infA, dtype=float), np.asarray(supA, dtype=float)
+    m, n = infA.shape
+    infb = np.asarray(infb, dtype=float).reshape(m, 1)
+    supb = np.asarray(supb, dtype=float).reshape(m, 1)
+    weight = ones((m, 1)) if weight is None else np.asarray(weight, dtype=float).reshape(m, 1)
+    Ac, Ar = 0.5 * (infA + supA), 0.5 * (supA - infA)
+    bc, br = 0.5 * (infb + supb), 0.5 * (supb - infb)
+
+    def tol_rows(x):
+        return (weight * (br - abs(bc - Ac @ x) - Ar @ abs(x))).ravel()
+
+    x = lstsq(Ac, bc, rcond=None)[0] if x0 is None else np.asarray(x0, dtype=float).reshape(n, 1)
+    rows = argsort(tol_rows(x))[:4 * (n + 1)]
+    stmt = {}
+    for round_num in range(max_rounds + 1):
+        if round_num == max_rounds:
+            rows = arange(m)
+        t, x, status = _tol_lp(Ac[rows], Ar[rows], bc[rows], br[rows], weight[rows])
+        tt = tol_rows(x)
+        stmt[len(stmt)] = {'rows': len(rows), 'Tol(x)': tt.min(), 'bound': t}
+        violated = np.setdiff1d(np.flatnonzero(tt < t - rtol * np.maximum(1., abs(t))), rows)
+        if len(violated) == 0:
+            break
+        violated = violated[argsort(tt[violated])[:4 * (n + 1)]]
+        rows = np.union1d(rows, violated)
+
+    tt = c_[arange(1, m + 1)[newaxis].conj().T, tt[:, newaxis]]
+    envs = tt[argsort(tt[:, 1]), :]
+    return envs[0, 1], x, envs, status, stmt
+
+
+# Граница выбора в режиме auto: LP с набором строк решается за миллисекунды
+# при любом m, пока число переменных 2n + 1 невелико; при больших n плотный
+# LP дороже r-алгоритма, и он выбирается, только если нужна точность
+# выше LP_MAX_EPS (epsf из varargin)
+LP_MAX_N = 100
+LP_MAX_EPS = 1.e-8
+
+
+# Параметры, которые понимает только один из методов; log принимают оба
+# (у LP протокол раундов stmt ведётся всегда, поэтому log там ни на что не влияет)
+RALG_ONLY_KWARGS = ("B0", "hs0", "return_state", "kernel")
+LP_ONLY_KWARGS = ("rtol", "max_rounds")
+
+
+def maximize_tol(infA, supA, infb, supb, *varargin, backend="auto", x0=None, **kwargs):
+    """Максимизация Tol выбранным методом: "ralg" - tolsolvty (r-алгоритм),
+    "lp" - tolsolvty_lp (точное решение), "auto" - LP при n <= LP_MAX_N или
+    epsf < LP_MAX_EPS, иначе r-алгоритм; параметры из RALG_ONLY_KWARGS или
+    LP_ONLY_KWARGS сразу выбирают свой метод. Параметры чужого метода дают
+    ValueError. Возвращает (tolmax, argmax, envs, ccode, stmt), для "ralg"
+    с return_state - ещё и состояние, как tolsolvty."""
+    ralg_only = [name for name in RALG_ONLY_KWARGS if name in kwargs]
+    lp_only = [name for name in LP_ONLY_KWARGS if name in kwargs]
+    if backend == "auto":
+        epsf = varargin[2] if len(varargin) >= 3 else 1.e-6
+        if ralg_only or lp_only:
+            backend = "ralg" if ralg_only else "lp"
+        else:
+            backend = "lp" if size(infA, 1) <= LP_MAX_N or epsf < LP_MAX_EPS else "ralg"
+    if backend == "lp":
+        unknown = [name for name in kwargs if name not in LP_ONLY_KWARGS and name != "log"]
+        if unknown:
+            raise ValueError(f"Ошибка: параметры {unknown} не поддерживаются методом lp.")
+        weight = varargin[1] if len(varargin) >= 2 else None
+        return tolsolvty_lp(infA, supA, infb, supb, weight, x0=x0, **{name: kwargs[name] for name in lp_only})
+    if backend == "ralg":
+        if lp_only:
+            raise ValueError(f"Ошибка: параметры {lp_only} не поддерживаются методом ralg.")
+        return tolsolvty(infA, supA, infb, supb, *varargin, x0=x0, **kwargs)
+    raise ValueError(f"Ошибка: неизвестный метод максимизации Tol: {backend}.")
@@ -1,21 +1,28 @@
-import copy
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 import intvalpy as ip
 import matplotlib.pyplot as plt
 
-from solver import tolsolvty
+from scipy.optimize import linprog
+from scipy.spatial import ConvexHull
+
+from solver import maximize_tol
 
 ip.precision.extendedPrecisionQ = False
 
 
-def emptinessTol(A, b):
-    maxTol = ip.linear.Tol.maximize(A, b)  # searchMaxTol
-    if maxTol[1] < 0:
-        return True, maxTol[0], maxTol[1]
-    else:
-        return False, maxTol[0], maxTol[1]
+# (пустота, argmax, tol_max) по готовому результату solve - без повторной максимизации
+def emptiness_from_solution(info):
+    tol_max, argmax = info[0], info[1]
+    return float(tol_max) < 0, np.ravel(argmax), float(tol_max)
+
+
+# backend: "lp" - точный максимум, "ralg" - r-алгоритм tolsolvty, "auto" - выбор по размеру.
+# cache - ResultCache: используется тот же результат, что и у solve с этим backend
+def emptinessTol(A, b, backend="auto", cache=None):
+    return emptiness_from_solution(solve(A, b, cache=cache, backend=backend))
 
 
 def b_correction(A, b, step=5):
@@ -26,11 +33,7 @@ def b_correction(A, b, step=5):
     return A, ip.Interval(new_b)
 
 
-def A_correction(A, b, step=5, tol_max=[1, 2]):
-    cols = len(tol_max)
-    rows = A.shape[0]
-    delta = np.min(np.sum(abs(tol_max[j]) * ip.rad(A[i][j]) for j in range(cols)) for i in range(rows))
-
+def A_correction(A, b, step=5):
     mid = ip.mid(A)
     new_rad = ip.rad(A) / step
     new_A = []
@@ -43,51 +46,375 @@ def A_correction(A, b, step=5, tol_max=[1, 2]):
     return ip.Interval(new_A), b
 
 
-def Ab_correction(A, b):
-    emptiness, _, _ = emptinessTol(A, b)
-    new_A = copy.deepcopy(A)
-    new_b = copy.deepcopy(b)
-
-    while emptiness:
-        new_A, _ = A_correction(new_A, new_b, step=2)
-        emptiness, _, _ = emptinessTol(new_A, new_b)
-        if not emptiness:
-            break
+class CorrectionSearch:
+    """Поиск минимальной коррекции, делающей множество решений непустым.
+
+    Радиусы корректируются одним множителем k >= 1: mode="b" - радиусы b
+    умножаются на k, mode="A" - радиусы A делятся на k, mode="Ab" - и то и
+    другое. max Tol монотонно растёт по k, нужен наименьший k с max Tol >= 0.
+
+    Для любой точки x наименьший k, при котором x допустима (bound), считается
+    в явном виде по строкам, поэтому поиск идёт итерациями Динкельбаха:
+    k_{j+1} = bound(argmax Tol при k_j). Последовательность убывает к границе
+    сверху, и каждый k_j гарантированно даёт непустое множество решений.
+    Строки Tol взвешиваются обратными производными по k в текущей точке
+    (вариант Круазе-Ферлана-Шейбла): знак max Tol от этого не меняется, а при
+    коррекции только b первая же итерация попадает точно в границу.
+    Каждое вычисление max Tol стартует из argmax предыдущего; после run в
+    evals лежит число вычислений max Tol.
+    """
+
+    def __init__(self, A, b, mode="Ab", backend="auto", xtol=1.e-10, max_evals=100):
+        if mode not in ("A", "b", "Ab"):
+            raise ValueError(f"Неизвестный режим коррекции: {mode}")
+        self.Ac, self.Ar, self.bc, self.br = tol_decomposition(A, b)
+        self.bc, self.br = self.bc.reshape(-1, 1), self.br.reshape(-1, 1)
+        self.mode = mode
+        self.backend = backend
+        self.xtol = xtol
+        self.max_evals = max_evals
+        self.evals = 0
+        self._x = None
+
+    def scaled(self, k):
+        A_rad = self.Ar / k if "A" in self.mode else self.Ar
+        b_rad = self.br * k if "b" in self.mode else self.br
+        return self.Ac - A_rad, self.Ac + A_rad, self.bc - b_rad, self.bc + b_rad
+
+    def weights(self, k):
+        """Обратные производные строк Tol по k в текущей точке."""
+        slope = self.br.copy() if "b" in self.mode else np.zeros_like(self.br)
+        if "A" in self.mode and self._x is not None and np.isfinite(k):
+            slope += self.Ar @ np.abs(self._x) / k ** 2
+        if not np.any(slope > 0):
+            return np.ones_like(self.br)
+        return 1. / np.maximum(slope, 1.e-12 * slope.max())
+
+    def max_tol(self, k):
+        if self.evals >= self.max_evals:
+            raise RuntimeError(f"Коррекция не найдена за {self.max_evals} вычислений Tol")
+        self.evals += 1
+        tol_max, self._x, _, _, _ = maximize_tol(*self.scaled(k), 1, self.weights(k), backend=self.backend,
+                                                 x0=self._x, log=False)
+        return float(tol_max)
+
+    def bound(self, x):
+        """Наименьший k, при котором Tol(x) >= 0 (inf, если такого нет).
+
+        Строка i допустима, если k br_i - |r_i| - a_i / k >= 0 в режиме Ab,
+        k br_i >= |r_i| + a_i в режиме b и br_i - |r_i| >= a_i / k в режиме A,
+        где r = bc - Ac x, a = Ar |x|."""
+        r = np.abs(self.bc - self.Ac @ x).ravel()
+        a = (self.Ar @ np.abs(x)).ravel()
+        br = self.br.ravel()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if self.mode == "b":
+                k = (r + a) / br
+            elif self.mode == "A":
+                k = np.where(a > 0, a / (br - r), 0.)
+                k[br < r] = np.inf
+            else:
+                k = (r + np.sqrt(r ** 2 + 4 * br * a)) / (2 * br)
+        k = np.where(np.isnan(k), 0., k)
+        return max(float(k.max()), 1.)
+
+    def run(self):
+        """Возвращает минимальный множитель k, при котором max Tol >= 0, с
+        относительным запасом xtol: иначе округление концов интервалов на
+        самой границе может дать max Tol порядка -1e-16."""
+        if self.max_tol(1.) >= 0:
+            return 1.
+        k_prev = np.inf
+        while True:
+            k = self.bound(self._x)
+            # При сужении A предел k -> inf - точечная матрица: стартуем с неё
+            if np.isinf(k) and self.mode == "A" and np.isinf(k_prev) and self.max_tol(np.inf) >= 0:
+                k = self.bound(self._x)
+            if np.isinf(k):
+                raise ValueError(f"Множество решений не становится непустым при коррекции {self.mode}")
+            if k_prev - k <= self.xtol * k:
+                return k * (1 + self.xtol)
+            self.max_tol(k)
+            k_prev = k
+
+
+def correct(A, b, mode="Ab", **kwargs):
+    """Минимальная коррекция (A, b) в режиме mode (см. CorrectionSearch).
+    Возвращает (A, b, info), info - множитель и число вычислений max Tol."""
+    search = CorrectionSearch(A, b, mode=mode, **kwargs)
+    k = search.run()
+    infA, supA, infb, supb = search.scaled(k)
+    info = {"factor": k, "evals": search.evals}
+    return ip.Interval(infA, supA), ip.Interval(infb.ravel(), supb.ravel()), info
+
+
+# Точка фронта: минимальное расширение b при радиусах A, уменьшенных в s раз
+def _front_point(Ac, Ar, infb, supb, s, backend):
+    search = CorrectionSearch(ip.Interval(Ac - Ar / s, Ac + Ar / s), ip.Interval(infb, supb), mode="b", backend=backend)
+    return search.run(), search.evals
+
+
+def pareto_front(A, b, s_max=None, points=9, refine_tol=0.05, max_rounds=4, processes=None, backend="auto"):
+    """Фронт Парето коррекций: для каждого множителя сужения радиусов A s >= 1
+    минимальный множитель расширения радиусов b k(s), при котором множество
+    решений непусто.
+
+    Начальная сетка по s геометрическая на [1, s_max]; по умолчанию s_max -
+    множитель чистой коррекции A (при нём k = 1), а если она невозможна - 64.
+    Затем на каждом из max_rounds раундов середины отрезков, где k меняется
+    больше чем на refine_tol от полного размаха, досчитываются заново.
+    Точки раунда считаются независимо, при processes > 1 - в пуле процессов.
+    Возвращает массив (N, 3) со столбцами s, k и число вычислений max Tol.
+    """
+    Ac, Ar, _, _ = tol_decomposition(A, b)
+    infb, supb = np.asarray(ip.inf(b), dtype=float), np.asarray(ip.sup(b), dtype=float)
+    if s_max is None:
+        try:
+            s_max = CorrectionSearch(A, b, mode="A", backend=backend).run()
+        except ValueError:
+            s_max = 64.
+    s_values = np.unique(np.geomspace(1., max(s_max, 1.), points))
+
+    pool = ProcessPoolExecutor(max_workers=processes) if processes is not None and processes > 1 else None
+
+    def evaluate(values):
+        args = [(Ac, Ar, infb, supb, s, backend) for s in values]
+        if pool is None:
+            return [_front_point(*item) for item in args]
+        return list(pool.map(_front_point, *zip(*args)))
+
+    try:
+        front = np.array([(s, *point) for s, point in zip(s_values, evaluate(s_values))]).reshape(-1, 3)
+        for _ in range(max_rounds):
+            k = front[:, 1]
+            span = k.max() - k.min()
+            coarse = np.flatnonzero(np.abs(np.diff(k)) > refine_tol * span) if span > 0 else []
+            if len(coarse) == 0:
+                break
+            s_new = np.sqrt(front[coarse, 0] * front[coarse + 1, 0])
+            new = np.array([(s, *point) for s, point in zip(s_new, evaluate(s_new))])
+            front = np.concatenate([front, new])
+            front = front[np.argsort(front[:, 0])]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return front
+
+
+def draw_pareto_front(front, need_save, need_show, path, **kwargs):
+    title_name = kwargs.get("title_name")
+    if not title_name:
+        raise ValueError("Отсутствует обязательный элемент: title_name для отрисовки фронта!")
+
+    fig, ax = plt.subplots()
+    ax.plot(front[:, 0], front[:, 1], "o-", color="black", markersize=3)
+    ax.fill_between(front[:, 0], front[:, 1], front[:, 1].max() * 1.1, color="grey", alpha=0.3,
+                    label="Tol set is not empty")
+    ax.set_xscale("log")
+    ax.set_xlabel("A radius shrink factor", fontsize=14)
+    ax.set_ylabel("b radius inflation factor", fontsize=14)
+    ax.set_title(title_name, fontsize=16, weight='bold')
+    ax.legend(loc="upper right")
+    ax.grid()
+
+    saved = []
+    if need_save:
+        saved.append(f"{path}/{title_name}.png")
+        fig.savefig(saved[-1], bbox_inches='tight')
+    if need_show:
+        plt.show()
+    plt.close(fig)
+    return saved
 
-        _, new_b = b_correction(new_A, new_b, step=2)
-        emptiness, _, _ = emptinessTol(new_A, new_b)
 
+def Ab_correction(A, b):
+    new_A, new_b, _ = correct(A, b, mode="Ab")
     return new_A, new_b
 
 
+# Середины и радиусы A и b - то же разложение, что в calcfg у tolsolvty
+def tol_decomposition(A, b):
+    infA, supA = np.asarray(ip.inf(A), dtype=float), np.asarray(ip.sup(A), dtype=float)
+    infb, supb = np.asarray(ip.inf(b), dtype=float), np.asarray(ip.sup(b), dtype=float)
+    return 0.5 * (infA + supA), 0.5 * (supA - infA), 0.5 * (infb + supb), 0.5 * (supb - infb)
+
+
+def tol_values(A, b, X, chunk_size=1 << 16):
+    """Значения распознающего функционала для пакета точек X (k x n):
+    Tol(x) = min_i (br_i - |bc_i - (Ac x)_i| - (Ar |x|)_i).
+
+    Точки обрабатываются блоками по chunk_size, чтобы промежуточные
+    массивы k x m не занимали лишнюю память.
+    """
+    Ac, Ar, bc, br = tol_decomposition(A, b)
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    result = np.empty(len(X))
+    for start in range(0, len(X), chunk_size):
+        chunk = X[start:start + chunk_size]
+        tt = br - np.abs(bc - chunk @ Ac.T) - np.abs(chunk) @ Ar.T
+        result[start:start + chunk_size] = tt.min(axis=1)
+    return result
+
+
+# Ортанты в порядке ip.IntLinIncR2: обход в положительном направлении с первого
+ORTHANTS = np.array([(1, 1), (-1, 1), (-1, -1), (1, -1)], dtype=float)
+
+
+def _is_bounded(G):
+    # Пересечение полуплоскостей ограничено, если нормали не оставляют разрыва в pi
+    angles = np.sort(np.arctan2(G[:, 1], G[:, 0]))
+    gaps = np.diff(np.append(angles, angles[0] + 2 * np.pi))
+    return gaps.max() < np.pi - 1e-12
+
+
+def _chebyshev_centers(Gs, hs):
+    """Центры и радиусы вписанных кругов для нескольких систем G x <= h одной
+    задачей LP: блоки независимы, поэтому максимум суммы радиусов достигается
+    на максимумах каждого блока. Радиус не ограничен снизу, чтобы пустой блок
+    не делал задачу несовместной: для него радиус получается отрицательным."""
+    k = len(Gs)
+    rows = sum(len(G) for G in Gs)
+    A_ub = np.zeros((rows, 3 * k))
+    offset = 0
+    for i, G in enumerate(Gs):
+        A_ub[offset:offset + len(G), 3 * i:3 * i + 2] = G
+        A_ub[offset:offset + len(G), 3 * i + 2] = np.hypot(G[:, 0], G[:, 1])
+        offset += len(G)
+    c = np.tile([0.0, 0.0, -1.0], k)
+    res = linprog(c, A_ub=A_ub, b_ub=np.concatenate(hs),
+                  bounds=[(None, None)] * (3 * k), method="highs")
+    if res.status != 0:
+        return np.zeros((k, 2)), np.zeros(k)
+    x = res.x.reshape(k, 3)
+    return x[:, :2], x[:, 2]
+
+
+def _halfplane_polygon(G, h, p):
+    """Вершины ограниченного пересечения полуплоскостей G x <= h против часовой
+    стрелки по внутренней точке p.
+
+    После сдвига в p полуплоскости a_i y <= c_i, c_i > 0, двойственны точкам
+    a_i / c_i, и рёбра их выпуклой оболочки (Qhull, O(m log m)) дают вершины.
+    """
+    c = h - G @ p
+    hull = ConvexHull(G / c[:, np.newaxis])
+    order = hull.vertices
+    # Вершина между соседними рёбрами i, j: a_i y = c_i, a_j y = c_j
+    pairs = np.stack([order, np.roll(order, -1)], axis=1)
+    return p + np.linalg.solve(G[pairs], c[pairs][..., np.newaxis])[..., 0]
+
+
+def _degenerate_piece(G, h):
+    """Допусковое множество без внутренних точек: отрезок или точка. Его концы -
+    крайние точки по осям координат (четыре LP); для точки они совпадают."""
+    points = []
+    for direction in np.vstack([np.eye(2), -np.eye(2)]):
+        res = linprog(direction, A_ub=G, b_ub=h, bounds=[(None, None)] * 2, method="highs")
+        if res.status == 0:
+            points.append(res.x)
+    if not points:
+        return np.empty((0, 2))
+    points = np.array(points)
+    dist = np.linalg.norm(points[:, np.newaxis] - points[np.newaxis], axis=-1)
+    i, j = np.unravel_index(dist.argmax(), dist.shape)
+    if dist[i, j] <= 1e-9 * max(1.0, np.abs(points).max()):
+        return points[:1]
+    return points[[i, j]]
+
+
+def _polygon_area(vertices):
+    x, y = vertices[:, 0], vertices[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def tol_set_polygons(A, b, bounds=None, cache=None):
+    """Допусковое множество системы с двумя неизвестными по ортантам.
+
+    В ортанте с |x| = S x условие Tol(x) >= 0 линейно:
+    (-Ac + Ar S) x <= br - bc, (Ac + Ar S) x <= br + bc, -S x <= 0,
+    и множество находится как пересечение этих 2m + 2 полуплоскостей.
+    bounds = [[x_min, y_min], [x_max, y_max]] добавляет ограничивающий
+    прямоугольник, как в ip.IntLinIncR2; без него неограниченное множество
+    даёт ValueError. Вырожденный кусок (отрезок или точка, например касание
+    границы ортанта) возвращается двумя или одной вершиной с нулевой площадью.
+    Возвращает (список вершин по ORTHANTS, площади).
+    """
+    if cache is not None:
+        points, counts, areas = cache.get_or_compute(
+            "tol_set", (A, b), lambda: _pack_polygons(*tol_set_polygons(A, b, bounds)),
+            bounds=None if bounds is None else np.asarray(bounds, dtype=float).tolist())
+        return np.split(points, np.cumsum(counts)[:-1]), areas
+
+    Ac, Ar, bc, br = tol_decomposition(A, b)
+    bc, br = bc.ravel(), br.ravel()
+    if Ac.shape[1] != 2:
+        raise ValueError("Ошибка: допусковое множество строится только для двух неизвестных!")
+
+    Gs, hs, empty = [], [], []
+    for signs in ORTHANTS:
+        G = np.vstack([-Ac + Ar * signs, Ac + Ar * signs, -np.diag(signs)])
+        h = np.concatenate([br - bc, br + bc, np.zeros(2)])
+        if bounds is not None:
+            lower, upper = np.asarray(bounds, dtype=float)
+            G = np.vstack([G, -np.eye(2), np.eye(2)])
+            h = np.concatenate([h, -lower, upper])
+        # Строки с нулевой нормалью либо выполнены всегда, либо делают ортант пустым
+        zero = ~G.any(axis=1)
+        empty.append(bool(np.any(h[zero] < 0)))
+        G, h = G[~zero], h[~zero]
+        if not _is_bounded(G):
+            raise ValueError("Ошибка: допусковое множество неограничено, задайте bounds!")
+        Gs.append(G)
+        hs.append(h)
+
+    # Отрицательный радиус вписанного круга - ортант пуст, нулевой - множество
+    # в нём вырождается в отрезок или точку
+    centers, radii = _chebyshev_centers(Gs, hs)
+    vertices, areas = [], np.zeros(len(ORTHANTS))
+    for k, (G, h) in enumerate(zip(Gs, hs)):
+        scale = max(1.0, np.abs(h).max())
+        if empty[k] or radii[k] < -1e-9 * scale:
+            vertices.append(np.empty((0, 2)))
+            continue
+        if radii[k] <= 1e-12 * scale:
+            vertices.append(_degenerate_piece(G, h))
+            continue
+        vertices.append(_halfplane_polygon(G, h, centers[k]))
+        areas[k] = _polygon_area(vertices[k])
+    return vertices, areas
+
+
+# Вершины всех ортантов одним массивом для ResultCache
+def _pack_polygons(vertices, areas):
+    return np.concatenate(vertices).reshape(-1, 2), np.array([len(item) for item in vertices]), areas
+
+
 def draw_Tol(A, b, max_x, max_Tol, need_save, need_show, path, **kwargs):
     title_name = kwargs.get("title_name")
     if not title_name:
         raise ValueError("Отсутствует обязательный элемент: title_name для отрисовки меша!")
+    resolution = kwargs.get("resolution", 100)
 
     # Настройка сетки значений для x1 и x2
     grid_min, grid_max = max_x[0] - 2, max_x[0] + 2
-    x_1_, x_2_ = np.mgrid[grid_min:grid_max:100j, grid_min:grid_max:100j]
-    list_x_1 = np.linspace(grid_min, grid_max, 100)
-    list_x_2 = np.linspace(grid_min, grid_max, 100)
-
-    # Подготовка tol значений
-    list_tol = np.zeros((100, 100))
-    for idx_x1, x1 in enumerate(list_x_1):
-        for idx_x2, x2 in enumerate(list_x_2):
-            x = [x1, x2]
-            tol_values = []
-            for i in range(len(b)):
-                sum_ = sum(A[i][j] * x[j] for j in range(len(x)))
-                rad_b, mid_b = ip.rad(b[i]), ip.mid(b[i])
-                tol = rad_b - ip.mag(mid_b - sum_)
-                tol_values.append(tol)
-            list_tol[idx_x1, idx_x2] = min(tol_values)
+    x_1_, x_2_ = np.mgrid[grid_min:grid_max:resolution * 1j, grid_min:grid_max:resolution * 1j]
+
+    # Подготовка tol значений сразу для всех узлов сетки (при наличии cache - один раз)
+    def grid_values():
+        points = np.column_stack([x_1_.ravel(), x_2_.ravel()])
+        return (tol_values(A, b, points).reshape(x_1_.shape),)
+
+    cache = kwargs.get("cache")
+    if cache is not None:
+        list_tol, = cache.get_or_compute("tol_grid", (A, b), grid_values, grid=(grid_min, grid_max, resolution))
+    else:
+        list_tol, = grid_values()
 
     # Генерация углов на основе max_Tol
     base_elev, base_azim = 30, 45  # Начальные углы для обзора
     angle_offsets = [(0, 0), (30, 0)]  # Смещения углов для 4 перспектив
     # Построение графика и сохранение с разных углов
+    saved = []
     for i, (elev_offset, azim_offset) in enumerate(angle_offsets):
         fig = plt.figure()
         ax = fig.add_subplot(111, projection='3d')
@@ -106,11 +433,13 @@ def draw_Tol(A, b, max_x, max_Tol, need_save, need_show, path, **kwargs):
         name = f"angle_{elev}_{azim}"
 
         if need_save:
-            fig.savefig(f"{path}/{name}.png", bbox_inches='tight')
+            saved.append(f"{path}/{name}.png")
+            fig.savefig(saved[-1], bbox_inches='tight')
         if need_show:
             plt.show(fig)
         plt.close(fig)
         # Применяем изменения к фигуре перед тем, как сохранять её
+    return saved
 
 
 def draw_tol_set(A, b, max_x, max_Tol, need_save, need_show, path, **kwargs):
@@ -119,8 +448,23 @@ def draw_tol_set(A, b, max_x, max_Tol, need_save, need_show, path, **kwargs):
     if not title_name:
         raise ValueError("Отсутствует обязательный элемент: title_name для отрисовки меша!")
 
-    # Вызов функции для построения tolerance set
-    ip.IntLinIncR2(A, b, consistency="tol")
+    # Многоугольники допускового множества по ортантам (при наличии cache - один раз на систему)
+    cache = kwargs.get("cache")
+    try:
+        vertices, _ = tol_set_polygons(A, b, bounds=kwargs.get("bounds"), cache=cache)
+    except ValueError:
+        if kwargs.get("bounds") is not None:
+            raise
+        # Неограниченное множество показываем в окрестности максимума Tol
+        bounds = [np.ravel(max_x) - 5, np.ravel(max_x) + 5]
+        vertices, _ = tol_set_polygons(A, b, bounds=bounds, cache=cache)
+
+    fig = plt.figure(figsize=(15, 15))
+    ax = fig.add_subplot(111)
+    for polygon in vertices:
+        if len(polygon):
+            ax.fill(polygon[:, 0], polygon[:, 1], linestyle='-', linewidth=1, color='gray', alpha=0.5)
+            ax.scatter(polygon[:, 0], polygon[:, 1], s=10, color='black', alpha=1)
 
     # Добавляем точку с максимальным значением tolerance
     plt.scatter(max_x[0], max_x[1], color='red', s=100, label=f"Max Tol: {max_Tol:.2f}")
@@ -134,21 +478,28 @@ def draw_tol_set(A, b, max_x, max_Tol, need_save, need_show, path, **kwargs):
     plt.legend(loc="upper right")
     plt.grid()
 
+    saved = []
     if need_save:
-        plt.savefig(f"{path}/{title_name}.png", bbox_inches='tight')
+        saved.append(f"{path}/{title_name}.png")
+        plt.savefig(saved[-1], bbox_inches='tight')
     if need_show:
         plt.show()
     plt.close()
+    return saved
+
 
 
 
 
 
+# Максимизация Tol: (tol_max, argmax, envs, stmt); backend - как в maximize_tol,
+# stmt - протокол итераций r-алгоритма или раундов LP
+def solve(A, b, cache=None, backend="ralg"):
+    if cache is not None:
+        return cache.get_or_compute("solve", (A, b), lambda: solve(A, b, backend=backend), backend=backend)
 
-def solve(A, b):
-    tol_max, argmax, envs, _, stmt = tolsolvty(infA=ip.inf(A), supA=ip.sup(A),
-                                           infb=ip.inf(b).reshape(-1, 1),
-                                           supb=ip.sup(b).reshape(-1, 1))
+    tol_max, argmax, envs, _, stmt = maximize_tol(ip.inf(A), ip.sup(A), ip.inf(b).reshape(-1, 1),
+                                                  ip.sup(b).reshape(-1, 1), backend=backend)
     return tol_max, argmax, envs, stmt
 
 # emptiness_, maxX, maxTol = emptinessTol(A_, b_)
@@ -0,0 +1,186 @@
+"""Сравнение производительности трёх реализаций интервальной арифметики:
+Lab1/interval_module.Interval (объекты), intvalpy (Lab2-Lab4) и IntervalArray
+(массивы концов numpy).
+
+Запуск:
+    python benchmarks/interval_backends.py --save results.json
+    python benchmarks/interval_backends.py --baseline results.json --threshold 0.25
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, "Lab1"), os.path.join(ROOT, "Lab3")]
+
+import intvalpy as ip
+from interval_module import Interval, IntervalArray
+from itools import scalar_to_interval_vec
+
+ip.precision.extendedPrecisionQ = False
+
+SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+# Объектные реализации на больших размерах работают минутами - ограничиваем их
+MAX_OBJECT_SIZE = 10_000
+
+
+def make_data(n, seed=0):
+    rng = np.random.default_rng(seed)
+    mid = rng.uniform(0.5, 1.5, size=(2, n))
+    return mid, 0.1
+
+
+# Подготовка операндов для каждой реализации: (a, b) по n элементов
+def build_lab1(mid, rad):
+    return [np.array([Interval(m - rad, m + rad) for m in row], dtype=object) for row in mid]
+
+
+def build_intvalpy(mid, rad):
+    return [ip.Interval(row - rad, row + rad) for row in mid]
+
+
+def build_array(mid, rad):
+    return [IntervalArray.from_mid_rad(row, rad) for row in mid]
+
+
+# Медиана интервалов - покомпонентная медиана концов
+def lab1_reductions():
+    def hull(a):
+        result = a[0]
+        for item in a[1:]:
+            result = result | item
+        return result
+
+    def intersection(a):
+        result = a[0]
+        for item in a[1:]:
+            result = result & item
+        return result
+
+    def median(a):
+        return Interval(np.median([item.lower for item in a]), np.median([item.upper for item in a]))
+
+    return hull, intersection, median
+
+
+def intvalpy_reductions():
+    def hull(a):
+        return ip.Interval(np.min(ip.inf(a)), np.max(ip.sup(a)))
+
+    def intersection(a):
+        return ip.Interval(np.max(ip.inf(a)), np.min(ip.sup(a)))
+
+    def median(a):
+        return ip.Interval(np.median(ip.inf(a)), np.median(ip.sup(a)))
+
+    return hull, intersection, median
+
+
+def array_reductions():
+    def median(a):
+        return IntervalArray(np.median(a.lower), np.median(a.upper))
+
+    return (lambda a: a.hull()), (lambda a: a.intersection()), median
+
+
+# Произведение интервальной матрицы k x k (k^2 ~ n) на точечный вектор
+def lab1_matvec(A, x):
+    return [sum((A[i][j] * x[j] for j in range(len(x))), Interval(0.0, 0.0)) for i in range(len(A))]
+
+
+BACKENDS = {
+    "lab1": (build_lab1, lab1_reductions(), lab1_matvec),
+    "intvalpy": (build_intvalpy, intvalpy_reductions(), lambda A, x: A @ x),
+    "array": (build_array, array_reductions(), lambda A, x: A @ x),
+}
+
+
+def construction_cases(mid, rad):
+    values = list(zip(mid[0] - rad, mid[0] + rad))
+    return {
+        "lab1": lambda: [Interval(lower, upper) for lower, upper in values],
+        "intvalpy": lambda: ip.Interval([list(pair) for pair in values]),
+        "intvalpy_vectorize": lambda: scalar_to_interval_vec(mid[0], rad),
+        "array": lambda: IntervalArray.from_mid_rad(mid[0], rad),
+    }
+
+
+def measure(func, min_time=0.05, repeat=3):
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(sizes=SIZES):
+    results = {}
+    for n in sizes:
+        mid, rad = make_data(n)
+        k = max(1, int(np.sqrt(n)))
+        x = np.linspace(-1, 1, k)
+        for name, (build, (hull, intersection, median), matvec) in BACKENDS.items():
+            if name != "array" and n > MAX_OBJECT_SIZE:
+                continue
+            a, b = build(mid, rad)
+            A = build(make_data(k * k, seed=1)[0], rad)[0].reshape((k, k))
+            cases = {
+                "add": lambda: a + b,
+                "mul": lambda: a * b,
+                "div": lambda: a / b,
+                "matvec": lambda: matvec(A, x),
+                "hull": lambda: hull(a),
+                "intersection": lambda: intersection(a),
+                "median": lambda: median(a),
+            }
+            for case, func in cases.items():
+                results[f"{case}/{name}/{n}"] = measure(func)
+        for name, func in construction_cases(mid, rad).items():
+            if name != "array" and n > MAX_OBJECT_SIZE:
+                continue
+            results[f"construct/{name}/{n}"] = measure(func)
+    return results
+
+
+def print_table(results):
+    print(f"{'case':<40}{'time, ms':>14}")
+    for key, value in results.items():
+        print(f"{key:<40}{value * 1e3:>14.4f}")
+
+
+# Сравнение с сохранённой базой: замедление больше threshold считается регрессией
+def compare(results, baseline, threshold):
+    regressions = []
+    for key, value in results.items():
+        if key in baseline and value > baseline[key] * (1 + threshold):
+            regressions.append((key, baseline[key], value))
+    for key, old, new in regressions:
+        print(f"РЕГРЕССИЯ {key}: {old * 1e3:.4f} ms -> {new * 1e3:.4f} ms ({new / old:.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--save", help="сохранить результаты в JSON")
+    parser.add_argument("--baseline", help="JSON с базовыми результатами для сравнения")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = run(args.sizes)
+    print_table(results)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
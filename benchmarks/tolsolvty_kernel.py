@@ -0,0 +1,105 @@
+"""Сравнение calcfg у tolsolvty (Lab2/solver.py) в обычном режиме и в режиме
+kernel (буферы, выделенные заранее, без протокола итераций).
+
+Для каждого размера (m, n) печатается время одного решения, время одного
+вызова calcfg и объём временной памяти на вызов (пик tracemalloc: заголовки
+и данные промежуточных массивов numpy).
+
+Запуск:
+    python benchmarks/tolsolvty_kernel.py --sizes 3x2 50x5 500x20
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import timeit
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "Lab2"))
+
+import solver
+
+SIZES = ("3x2", "50x5", "500x20", "5000x50")
+
+
+def make_system(m, n, seed=0):
+    rng = np.random.default_rng(seed)
+    Am, Ar = rng.uniform(-2, 2, (m, n)), rng.uniform(0, 0.3, (m, n))
+    bm, br = rng.uniform(-3, 3, (m, 1)), rng.uniform(0.1, 0.5, (m, 1))
+    return Am - Ar, Am + Ar, bm - br, bm + br
+
+
+# calcfg обоих режимов в том виде, в каком их строит tolsolvty
+def make_calcfg(infA, supA, infb, supb, kernel):
+    Ac, Ar = 0.5 * (infA + supA), 0.5 * (supA - infA)
+    bc, br = 0.5 * (infb + supb), 0.5 * (supb - infb)
+    weight = np.ones((len(infA), 1))
+    if kernel:
+        g_out = np.empty((infA.shape[1], 1))
+        calcfg = solver._kernel_calcfg(infA, supA, Ac, Ar, bc, br, weight)
+        return lambda x: calcfg(x, g_out)
+
+    def calcfg(x):
+        absx = np.abs(x)
+        Ac_x = Ac @ x
+        Ar_absx = Ar @ absx
+        infs = bc - (Ac_x + Ar_absx)
+        sups = bc - (Ac_x - Ar_absx)
+        tt = weight * (br - np.maximum(np.abs(infs), np.abs(sups)))
+        f, mc = np.min(tt), np.argmin(tt)
+        infA_mc = infA[[mc], :].conj().T
+        supA_mc = supA[[mc], :].conj().T
+        dl = infA_mc * (x < 0) + supA_mc * (x >= 0)
+        ds = supA_mc * (x < 0) + infA_mc * (x >= 0)
+        g = -weight[mc, 0] * dl if -infs[mc, 0] > sups[mc, 0] else weight[mc, 0] * ds
+        return f, g, tt
+
+    return calcfg
+
+
+def temporary_bytes(func, calls=100):
+    func()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    for _ in range(calls):
+        func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak - base
+
+
+def best_time(func, repeat=5):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(sizes=SIZES):
+    print(f"{'size':<10}{'mode':<8}{'solve, ms':>12}{'calcfg, us':>12}{'temp, B':>10}{'ncals':>8}")
+    for size in sizes:
+        m, n = map(int, size.split("x"))
+        system = make_system(m, n)
+        x = np.linspace(-1, 1, n).reshape(n, 1)
+        for kernel in (False, True):
+            calcfg = make_calcfg(*system, kernel)
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = solver.tolsolvty(*system, return_state=True, kernel=kernel)
+                solve = best_time(lambda: solver.tolsolvty(*system, kernel=kernel), repeat=3)
+            mode = "kernel" if kernel else "legacy"
+            print(f"{size:<10}{mode:<8}{solve * 1e3:>12.3f}{best_time(lambda: calcfg(x)) * 1e6:>12.2f}"
+                  f"{temporary_bytes(lambda: calcfg(x)):>10}{result[-1]['ncals']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=SIZES)
+    run(parser.parse_args().sizes)
+
+
+if __name__ == "__main__":
+    main()